@@ -15,140 +15,455 @@ Usage:
 """
 
 import argparse
+import concurrent.futures
+import contextlib
 import functools
 import html as html_mod
 import http.server
 import json
+import mmap
 import os
 import re
+import stat
 import sys
+import tempfile
 import urllib.parse
 from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
+from typing import Optional
 
-VERSION = "2.7.0"
-
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:
+    orjson = None
 
-def detect_benchmark_name(pre_file, post_file):
-    """Detect benchmark name from audit filenames.
+VERSION = "2.7.0"
 
-    Looks for patterns like 'rhel10cis', 'ubuntu2204stig', 'amazon2023stig'
-    in the filenames. Falls back to 'Lockdown Goss Audit' if no match.
-    """
-    # Common benchmark prefixes in Ansible-Lockdown audit filenames
-    pattern = re.compile(
-        r'((?:rhel|ubuntu|amazon|debian|suse)\d{1,10}(?:cis|stig))',
-        re.IGNORECASE
-    )
-    for filepath in (pre_file, post_file):
-        basename = Path(filepath).name
-        match = pattern.search(basename)
+# Common benchmark prefixes in Ansible-Lockdown audit filenames
+BENCHMARK_NAME_RE = re.compile(r'((?:rhel|ubuntu|amazon|debian|suse)\d{1,10}(?:cis|stig))', re.IGNORECASE)
+BENCHMARK_NAME_PARTS_RE = re.compile(r'([a-zA-Z]{1,20})(\d{1,10})(cis|stig)', re.IGNORECASE)
+# Match common version patterns: v1_0_0, v1.2.0, v1r2
+BENCHMARK_VERSION_RE = re.compile(r'(v\d{1,10}(?:[\._]\d{1,10}[\._]\d{1,10}|r\d{1,10}))', re.IGNORECASE)
+# Leading control ID in a test title, in one pass:
+#   STIG format: XXXX-XX-XXXXXX (e.g., RHEL-09-123456, UBTU-22-654321)
+#   CIS format: digits separated by dots (e.g., 1.1.1.1, 5.2.3)
+# The branches start with a letter and a digit respectively, so they never overlap.
+CONTROL_ID_RE = re.compile(r'(?P<stig>[A-Z]+-\d{1,10}-\d{1,10})|(?P<cis>\d+(?:\.\d+){1,10})')
+# Characters replaced with '_' in generated report filenames
+UNSAFE_NAME_CHARS_RE = re.compile(r'[^a-zA-Z0-9_-]')
+UNSAFE_VERSION_CHARS_RE = re.compile(r'[^a-zA-Z0-9_.-]')
+
+
+def _benchmark_name_from(basenames):
+    """Return the formatted benchmark name found in basenames, or None."""
+    for basename in basenames:
+        match = BENCHMARK_NAME_RE.search(basename)
         if match:
             raw = match.group(1)
             # Format nicely: "RHEL10 CIS", "Ubuntu2204 STIG", etc.
-            inner = re.match(r'([a-zA-Z]{1,20})(\d{1,10})(cis|stig)', raw, re.IGNORECASE)
+            inner = BENCHMARK_NAME_PARTS_RE.match(raw)
             if inner:
                 os_name = inner.group(1).upper()
                 version = inner.group(2)
                 bench_type = inner.group(3).upper()
                 return f"{os_name}{version} {bench_type}"
             return raw.upper()
-    return "Lockdown Goss Audit"
+    return None
+
+
+def _benchmark_version_from(basenames):
+    """Return the first benchmark version found in basenames, or None."""
+    for basename in basenames:
+        match = BENCHMARK_VERSION_RE.search(basename)
+        if match:
+            return match.group(1)
+    return None
+
+
+def detect_benchmark_name(pre_file, post_file):
+    """Detect benchmark name from audit filenames.
+
+    Looks for patterns like 'rhel10cis', 'ubuntu2204stig', 'amazon2023stig'
+    in the filenames. Falls back to 'Lockdown Goss Audit' if no match. Only
+    the basenames are inspected; the audit files themselves are never opened.
+    """
+    names = (Path(pre_file).name, Path(post_file).name)
+    return _benchmark_name_from(names) or "Lockdown Goss Audit"
 
 
 def detect_benchmark_version(pre_file, post_file):
     """Detect benchmark version from audit filenames.
 
     Looks for version patterns like 'v1_0_0', 'v1.2.0', 'v1r2' in filenames.
-    Falls back to 'unknown' if no match.
+    Falls back to 'unknown' if no match. Only the basenames are inspected;
+    the audit files themselves are never opened.
     """
-    # Match common version patterns: v1_0_0, v1.2.0, v1r2
-    pattern = re.compile(r'(v\d{1,10}(?:[\._]\d{1,10}[\._]\d{1,10}|r\d{1,10}))', re.IGNORECASE)
-    for filepath in (pre_file, post_file):
-        basename = Path(filepath).name
-        match = pattern.search(basename)
-        if match:
-            return match.group(1)
-    return 'unknown'
+    names = (Path(pre_file).name, Path(post_file).name)
+    return _benchmark_version_from(names) or 'unknown'
 
 
-def load_audit_file(filepath):
-    """Load and parse a Lockdown Goss Audit JSON file."""
-    try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File not found: {filepath}", file=sys.stderr)
-        sys.exit(2)
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in {filepath}: {e}", file=sys.stderr)
-        sys.exit(2)
+def detect_benchmark(pre_file, post_file):
+    """Detect (name, version) from audit filenames.
+
+    Equivalent to calling detect_benchmark_name and detect_benchmark_version,
+    but each path's basename is taken only once.
+    """
+    names = (Path(pre_file).name, Path(post_file).name)
+    return (_benchmark_name_from(names) or "Lockdown Goss Audit",
+            _benchmark_version_from(names) or 'unknown')
+
+
+@dataclass
+class TestResult:
+    """One test from a Lockdown Goss Audit, as extracted by extract_results().
+
+    Slotted because one instance is created per test in each audit; it is
+    a fraction of the size of the equivalent dict and fields load directly.
+    """
+    __slots__ = ('title', 'control_id', 'resource_type', 'resource_id', 'property',
+                 'successful', 'skipped', 'summary_line', 'expected', 'found')
+    title: str
+    control_id: str
+    resource_type: str
+    resource_id: str
+    property: str
+    successful: bool
+    skipped: bool
+    summary_line: str
+    expected: list
+    found: list
 
 
 def extract_results(audit_data):
-    """Extract test results from Lockdown Goss Audit data."""
+    """Extract test results from Lockdown Goss Audit data as TestResult records."""
     results = {}
 
     if 'results' not in audit_data:
         print("Warning: No 'results' key found in audit data", file=sys.stderr)
         return results
 
+    control_match = CONTROL_ID_RE.match
+    intern = sys.intern
     for result in audit_data['results']:
-        # Build a unique key for each test
-        resource_type = result.get('resource-type', 'unknown')
-        resource_id = result.get('resource-id', 'unknown')
-        property_name = result.get('property', 'unknown')
-        title = result.get('title', '')
+        g = result.get
+        # Resource types, properties and control IDs repeat across many tests;
+        # interning makes records share one string object per distinct value.
+        # Null or non-string values (still valid JSON) are kept as they are.
+        resource_type = g('resource-type', 'unknown')
+        if type(resource_type) is str:
+            resource_type = intern(resource_type)
+        resource_id = g('resource-id', 'unknown')
+        property_name = g('property', 'unknown')
+        if type(property_name) is str:
+            property_name = intern(property_name)
+        title = g('title', '')
 
         # Extract control ID from title if present
         # Supports CIS (e.g., "1.1.1.1") and STIG (e.g., "RHEL-09-123456") formats
         control_id = ''
         if title:
-            # STIG format: XXXX-XX-XXXXXX (e.g., RHEL-09-123456, UBTU-22-654321)
-            stig_match = re.match(r'([A-Z]+-\d{1,10}-\d{1,10})', title)
-            # CIS format: digits separated by dots (e.g., 1.1.1.1, 5.2.3)
-            cis_match = re.match(r'(\d+(?:\.\d+){1,10})', title)
-            if stig_match:
-                control_id = stig_match.group(1)
-            elif cis_match:
-                control_id = cis_match.group(1)
+            match = control_match(title)
+            if match:
+                control_id = match.group('stig') or match.group('cis')
             else:
                 # Fallback: first token before pipe delimiter
-                parts = title.split('|')
-                if parts:
-                    control_id = parts[0].strip()
-
-        key = f"{resource_type}::{resource_id}::{property_name}"
-
-        results[key] = {
-            'title': title,
-            'control_id': control_id,
-            'resource_type': resource_type,
-            'resource_id': resource_id,
-            'property': property_name,
-            'successful': result.get('successful', False),
-            'skipped': result.get('skipped', False),
-            'summary_line': result.get('summary-line', ''),
-            'expected': result.get('expected', []),
-            'found': result.get('found', []),
-        }
+                control_id = title.split('|', 1)[0].strip()
+            control_id = intern(control_id)
+
+        # Unique key for each test
+        results[f"{resource_type}::{resource_id}::{property_name}"] = TestResult(
+            title, control_id, resource_type, resource_id, property_name,
+            g('successful', False), g('skipped', False), g('summary-line', ''),
+            g('expected', []), g('found', []),
+        )
 
     return results
 
 
 def extract_summary(audit_data):
-    """Extract summary statistics from audit data."""
+    """Extract summary statistics from audit data.
+
+    ``compliance_rate`` is the passed percentage of all tests (0 when the
+    audit has none), computed once here for every report format.
+    """
     summary = audit_data.get('summary', {})
+    total = summary.get('test-count', 0)
+    passed = total - summary.get('failed-count', 0) - summary.get('skipped-count', 0)
     return {
-        'total': summary.get('test-count', 0),
+        'total': total,
         'failed': summary.get('failed-count', 0),
         'skipped': summary.get('skipped-count', 0),
-        'passed': summary.get('test-count', 0) - summary.get('failed-count', 0) - summary.get('skipped-count', 0),
+        'passed': passed,
         'duration': summary.get('total-duration', 0),
+        'compliance_rate': (passed / total * 100) if total > 0 else 0,
     }
 
 
+# Audits larger than this are parsed member-by-member (see _iter_audit_members)
+STREAM_PARSE_THRESHOLD = 16 * 1024 * 1024
+
+_JSON_WS_RE = re.compile(r'[ \t\n\r]*')
+
+
+def _json_loads(data):
+    """Parse JSON bytes, using orjson if available.
+
+    Input orjson rejects (e.g. a UTF-8 BOM) is retried with the stdlib
+    parser, which also produces the error message for genuinely bad JSON.
+    Note that orjson reads integers beyond 64 bits as floats.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _json_dumps_indented(obj):
+    """Serialize obj as two-space indented JSON, using orjson if available.
+
+    Values orjson cannot encode (e.g. integers beyond 64 bits, which
+    _json_loads accepts via its fallback) are written by the stdlib encoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, indent=2)
+
+
+def _iter_audit_members(text):
+    """Yield (name, value) for each top-level member of an audit document.
+
+    Members are decoded one at a time with ``JSONDecoder.raw_decode``. An
+    array-valued ``results`` member is yielded as a lazy iterator over its
+    entries, so each entry can be consumed and dropped before the next one
+    is decoded; any entries left unread are skipped when the generator is
+    advanced.
+    """
+    decoder = json.JSONDecoder()
+    skip_ws = _JSON_WS_RE.match
+    idx = 0
+
+    def expect(char):
+        nonlocal idx
+        idx = skip_ws(text, idx).end()
+        if text[idx:idx + 1] != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", text, idx)
+        idx += 1
+
+    def iter_entries():
+        nonlocal idx
+        idx = skip_ws(text, idx + 1).end()
+        in_array = text[idx:idx + 1] != ']'
+        while in_array:
+            item, idx = decoder.raw_decode(text, idx)
+            yield item
+            idx = skip_ws(text, idx).end()
+            in_array = text[idx:idx + 1] == ','
+            if in_array:
+                idx = skip_ws(text, idx + 1).end()
+        expect(']')
+
+    expect('{')
+    idx = skip_ws(text, idx).end()
+    more = text[idx:idx + 1] != '}'
+    while more:
+        name, idx = decoder.raw_decode(text, skip_ws(text, idx).end())
+        if not isinstance(name, str):
+            raise json.JSONDecodeError("Expecting property name", text, idx)
+        expect(':')
+        idx = skip_ws(text, idx).end()
+        if name == 'results' and text[idx:idx + 1] == '[':
+            entries = iter_entries()
+            yield name, entries
+            for _ in entries:
+                pass
+        else:
+            value, idx = decoder.raw_decode(text, idx)
+            yield name, value
+        idx = skip_ws(text, idx).end()
+        more = text[idx:idx + 1] == ','
+        if more:
+            idx += 1
+    expect('}')
+    idx = skip_ws(text, idx).end()
+    if idx != len(text):
+        raise json.JSONDecodeError("Extra data", text, idx)
+
+
+def _stream_extract_audit(text):
+    """Parse a large audit and extract its (results, summary) in one pass.
+
+    Streamed ``results`` entries are fed straight into extract_results, so
+    neither the raw entries nor a trimmed copy of them is ever held as a
+    list; only the extracted records accumulate.
+    """
+    audit_data = {}
+    results = None
+    for name, value in _iter_audit_members(text):
+        if name in ('results', 'summary'):
+            audit_data[name] = value
+        if name == 'results':
+            results = extract_results(audit_data)
+            audit_data[name] = ()
+    if results is None:
+        results = extract_results(audit_data)
+    return results, extract_summary(audit_data)
+
+
+def _read_audit_source(filepath):
+    """Return the contents of an audit file for parsing.
+
+    Files above STREAM_PARSE_THRESHOLD are memory-mapped and decoded straight
+    from the page cache (no intermediate bytes copy) and returned as str for
+    the streaming parser; smaller files are returned as raw bytes, which
+    _json_loads decodes in C, skipping the text-mode layer.
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > STREAM_PARSE_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                return str(mm, 'utf-8-sig')
+        return f.read()
+
+
+@contextlib.contextmanager
+def _exit_on_load_error(filepath):
+    """Report an unreadable or malformed audit file and exit with status 2."""
+    try:
+        yield
+    except FileNotFoundError:
+        print(f"Error: File not found: {filepath}", file=sys.stderr)
+        sys.exit(2)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        print(f"Error: Invalid JSON in {filepath}: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+def parse_audit_file(filepath):
+    """Parse an audit file and return its (results, summary).
+
+    Files above STREAM_PARSE_THRESHOLD are extracted while they are streamed
+    (see _stream_extract_audit); smaller ones are parsed whole, and the parse
+    tree is released when this returns. Raises OSError, UnicodeDecodeError
+    or json.JSONDecodeError (a ValueError) on unreadable input.
+    """
+    source = _read_audit_source(filepath)
+    if isinstance(source, str):
+        return _stream_extract_audit(source)
+    audit_data = _json_loads(source)
+    return extract_results(audit_data), extract_summary(audit_data)
+
+
+# Bump when the records stored by --cache change shape, e.g. TestResult fields
+AUDIT_CACHE_FORMAT = 1
+
+_TEST_RESULT_FIELDS = TestResult.__slots__
+
+
+def _load_audit_cache(cache_path):
+    """Return the per-audit entries of a --cache file.
+
+    Returns {} if the file is missing, unreadable, or was written by a
+    different version of the tool.
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            data = _json_loads(f.read())
+        if data['header'] == [VERSION, AUDIT_CACHE_FORMAT] and isinstance(data['audits'], dict):
+            return data['audits']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return {}
+
+
+def _save_audit_cache(cache_path, audits):
+    """Atomically write a --cache file; failures are ignored."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'header': [VERSION, AUDIT_CACHE_FORMAT], 'audits': audits}))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+
+def _results_from_cache(rows):
+    """Rebuild extract_results() output from rows stored by --cache."""
+    intern = sys.intern
+    results = {}
+    for key, title, control_id, resource_type, resource_id, property_name, *rest in rows:
+        if type(resource_type) is str:
+            resource_type = intern(resource_type)
+        if type(property_name) is str:
+            property_name = intern(property_name)
+        results[key] = TestResult(title, intern(control_id), resource_type,
+                                  resource_id, property_name, *rest)
+    return results
+
+
+def load_audit_results(filepath, cache=None, new_cache=None):
+    """Load an audit file and return its (results, summary).
+
+    ``cache`` holds the entries read from a --cache file, keyed by resolved
+    path. An entry is reused while the file's (st_mtime_ns, st_size) are
+    unchanged, so repeat runs against the same audits skip JSON parsing;
+    otherwise the file is parsed. Either way the entry is stored in
+    ``new_cache`` for writing back.
+    """
+    stamp = None
+    if new_cache is not None:
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            pass  # let parse_audit_file report the error
+        else:
+            resolved = os.path.realpath(filepath)
+            stamp = [st.st_mtime_ns, st.st_size]
+            entry = cache.get(resolved)
+            if isinstance(entry, list) and len(entry) == 3 and entry[0] == stamp:
+                try:
+                    results = _results_from_cache(entry[1])
+                except (TypeError, ValueError):
+                    pass
+                else:
+                    new_cache[resolved] = entry
+                    return results, entry[2]
+
+    with _exit_on_load_error(filepath):
+        results, summary = parse_audit_file(filepath)
+
+    if stamp is not None:
+        rows = [[key] + [getattr(result, field) for field in _TEST_RESULT_FIELDS]
+                for key, result in results.items()]
+        new_cache[resolved] = [stamp, rows, summary]
+    return results, summary
+
+
+@dataclass
+class ComparisonItem:
+    """One test's pre/post records as bucketed by compare_audits().
+
+    ``pre`` is None for new tests and ``post`` is None for removed tests.
+    ``control_id`` is resolved once here (from pre when present, else post;
+    'Unknown' when empty) so group_by_control need not re-derive it.
+    Slotted because one instance is created per test in the larger audit.
+    """
+    __slots__ = ('key', 'pre', 'post', 'control_id')
+    key: str
+    pre: Optional[TestResult]
+    post: Optional[TestResult]
+    control_id: str
+
+
 def compare_audits(pre_results, post_results):
     """Compare pre and post audit results."""
     comparison = {
@@ -161,83 +476,68 @@ def compare_audits(pre_results, post_results):
         'skipped': [],       # Skipped in either
     }
 
-    all_keys = set(pre_results.keys()) | set(post_results.keys())
-
-    for key in all_keys:
-        pre = pre_results.get(key)
-        post = post_results.get(key)
-
-        if pre is None:
-            comparison['new_tests'].append({
-                'key': key,
-                'post': post
-            })
-            continue
-
+    # Bind the bucket appends once; this loop runs once per test in both audits.
+    # Pre-sizing the lists ([None] * n plus an index) measured ~40% slower than
+    # a bound append in CPython, whose over-allocation already amortizes growth.
+    add_fixed = comparison['fixed'].append
+    add_regressed = comparison['regressed'].append
+    add_still_failed = comparison['still_failed'].append
+    add_still_passed = comparison['still_passed'].append
+    add_new = comparison['new_tests'].append
+    add_removed = comparison['removed_tests'].append
+    add_skipped = comparison['skipped'].append
+
+    # Walk the pre audit once (one probe into post per key), then sweep post for
+    # keys pre lacks. No key sets are built, and buckets keep audit file order.
+    post_get = post_results.get
+    for key, pre in pre_results.items():
+        post = post_get(key)
         if post is None:
-            comparison['removed_tests'].append({
-                'key': key,
-                'pre': pre
-            })
-            continue
-
-        # Skip if either is skipped
-        if pre.get('skipped') or post.get('skipped'):
-            comparison['skipped'].append({
-                'key': key,
-                'pre': pre,
-                'post': post
-            })
+            add_removed(ComparisonItem(key, pre, None, pre.control_id or 'Unknown'))
             continue
-
-        pre_passed = pre.get('successful', False)
-        post_passed = post.get('successful', False)
-
-        if not pre_passed and post_passed:
-            comparison['fixed'].append({
-                'key': key,
-                'pre': pre,
-                'post': post
-            })
-        elif pre_passed and not post_passed:
-            comparison['regressed'].append({
-                'key': key,
-                'pre': pre,
-                'post': post
-            })
-        elif not pre_passed and not post_passed:
-            comparison['still_failed'].append({
-                'key': key,
-                'pre': pre,
-                'post': post
-            })
+        entry = ComparisonItem(key, pre, post, pre.control_id or 'Unknown')
+
+        # Skip if either is skipped (extract_results always sets both flags).
+        # The common still-passed case is decided in three attribute tests; a
+        # dict dispatch on (pre.successful, post.successful) measured ~2x
+        # slower here because of the tuple build and bound-method call.
+        if pre.skipped or post.skipped:
+            add_skipped(entry)
+        elif pre.successful:
+            if post.successful:
+                add_still_passed(entry)
+            else:
+                add_regressed(entry)
+        elif post.successful:
+            add_fixed(entry)
         else:
-            comparison['still_passed'].append({
-                'key': key,
-                'pre': pre,
-                'post': post
-            })
+            add_still_failed(entry)
+
+    # Every post key matched a pre key unless post has more keys than were
+    # matched; only then is the sweep for new tests needed.
+    if len(post_results) > len(pre_results) - len(comparison['removed_tests']):
+        for key, post in post_results.items():
+            if key not in pre_results:
+                add_new(ComparisonItem(key, None, post, post.control_id or 'Unknown'))
 
     return comparison
 
 
+def _control_sort_key(control_id):
+    """Sort key that orders dotted CIS IDs numerically (1.2 before 1.10)."""
+    return tuple(
+        (0, int(part), '') if part.isdecimal() else (1, 0, part)
+        for part in control_id.split('.')
+    )
+
+
 def group_by_control(items):
-    """Group comparison items by CIS control ID."""
+    """Group comparison items by CIS control ID, in numeric control order."""
     grouped = defaultdict(list)
     for item in items:
-        # Get control_id from pre or post
-        control_id = ''
-        if 'pre' in item and item['pre']:
-            control_id = item['pre'].get('control_id', '')
-        elif 'post' in item and item['post']:
-            control_id = item['post'].get('control_id', '')
-
-        if not control_id:
-            control_id = 'Unknown'
-
-        grouped[control_id].append(item)
+        grouped[item.control_id].append(item)
 
-    return dict(sorted(grouped.items()))
+    return {control_id: grouped[control_id] for control_id in sorted(grouped, key=_control_sort_key)}
 
 
 def format_duration(nanoseconds):
@@ -252,115 +552,122 @@ def format_duration(nanoseconds):
     return f"{minutes}m {remaining:.1f}s"
 
 
-def format_text_report(comparison, pre_summary, post_summary, pre_file, post_file, benchmark="Lockdown Goss Audit", summary_only=False):
-    """Generate a text format report."""
-    lines = []
-    lines.append("=" * 80)
-    lines.append(f"{benchmark.upper()} COMPARISON REPORT")
-    lines.append("=" * 80)
-    lines.append("")
-    lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"Pre-audit file:  {pre_file}")
-    lines.append(f"Post-audit file: {post_file}")
-    lines.append("")
+def iter_text_report(comparison, pre_summary, post_summary, pre_file, post_file, benchmark="Lockdown Goss Audit", summary_only=False, generated=None):
+    """Yield the lines of a text format report.
+
+    ``generated`` is the report timestamp; it defaults to the current time.
+    """
+    generated = generated or datetime.now()
+    yield "=" * 80
+    yield f"{benchmark.upper()} COMPARISON REPORT"
+    yield "=" * 80
+    yield ""
+    yield f"Generated: {generated:%Y-%m-%d %H:%M:%S}"
+    yield f"Pre-audit file:  {pre_file}"
+    yield f"Post-audit file: {post_file}"
+    yield ""
 
     # Summary section
-    lines.append("-" * 80)
-    lines.append("SUMMARY")
-    lines.append("-" * 80)
-    lines.append("")
-    lines.append(f"{'Metric':<30} {'Pre-Audit':>15} {'Post-Audit':>15} {'Change':>15}")
-    lines.append("-" * 75)
-    lines.append(f"{'Total Tests':<30} {pre_summary['total']:>15} {post_summary['total']:>15} {post_summary['total'] - pre_summary['total']:>+15}")
-    lines.append(f"{'Passed':<30} {pre_summary['passed']:>15} {post_summary['passed']:>15} {post_summary['passed'] - pre_summary['passed']:>+15}")
-    lines.append(f"{'Failed':<30} {pre_summary['failed']:>15} {post_summary['failed']:>15} {post_summary['failed'] - pre_summary['failed']:>+15}")
-    lines.append(f"{'Skipped':<30} {pre_summary['skipped']:>15} {post_summary['skipped']:>15} {post_summary['skipped'] - pre_summary['skipped']:>+15}")
+    yield "-" * 80
+    yield "SUMMARY"
+    yield "-" * 80
+    yield ""
+    yield f"{'Metric':<30} {'Pre-Audit':>15} {'Post-Audit':>15} {'Change':>15}"
+    yield "-" * 75
+    yield f"{'Total Tests':<30} {pre_summary['total']:>15} {post_summary['total']:>15} {post_summary['total'] - pre_summary['total']:>+15}"
+    yield f"{'Passed':<30} {pre_summary['passed']:>15} {post_summary['passed']:>15} {post_summary['passed'] - pre_summary['passed']:>+15}"
+    yield f"{'Failed':<30} {pre_summary['failed']:>15} {post_summary['failed']:>15} {post_summary['failed'] - pre_summary['failed']:>+15}"
+    yield f"{'Skipped':<30} {pre_summary['skipped']:>15} {post_summary['skipped']:>15} {post_summary['skipped'] - pre_summary['skipped']:>+15}"
 
     pre_dur = format_duration(pre_summary['duration'])
     post_dur = format_duration(post_summary['duration'])
-    lines.append(f"{'Scan Duration':<30} {pre_dur:>15} {post_dur:>15}")
-    lines.append("")
+    yield f"{'Scan Duration':<30} {pre_dur:>15} {post_dur:>15}"
+    yield ""
 
     # Compliance percentage
-    pre_compliance = (pre_summary['passed'] / pre_summary['total'] * 100) if pre_summary['total'] > 0 else 0
-    post_compliance = (post_summary['passed'] / post_summary['total'] * 100) if post_summary['total'] > 0 else 0
-    lines.append(f"{'Compliance Rate':<30} {pre_compliance:>14.1f}% {post_compliance:>14.1f}% {post_compliance - pre_compliance:>+14.1f}%")
-    lines.append("")
+    pre_compliance = pre_summary['compliance_rate']
+    post_compliance = post_summary['compliance_rate']
+    yield f"{'Compliance Rate':<30} {pre_compliance:>14.1f}% {post_compliance:>14.1f}% {post_compliance - pre_compliance:>+14.1f}%"
+    yield ""
 
     # Changes summary
-    lines.append("-" * 80)
-    lines.append("CHANGES BREAKDOWN")
-    lines.append("-" * 80)
-    lines.append("")
-    lines.append(f"  Fixed (Failed -> Passed):     {len(comparison['fixed']):>5}")
-    lines.append(f"  Regressed (Passed -> Failed): {len(comparison['regressed']):>5}")
-    lines.append(f"  Still Failed:                 {len(comparison['still_failed']):>5}")
-    lines.append(f"  Still Passed:                 {len(comparison['still_passed']):>5}")
-    lines.append(f"  Skipped:                      {len(comparison['skipped']):>5}")
-    lines.append(f"  New Tests:                    {len(comparison['new_tests']):>5}")
-    lines.append(f"  Removed Tests:                {len(comparison['removed_tests']):>5}")
-    lines.append("")
+    yield "-" * 80
+    yield "CHANGES BREAKDOWN"
+    yield "-" * 80
+    yield ""
+    yield f"  Fixed (Failed -> Passed):     {len(comparison['fixed']):>5}"
+    yield f"  Regressed (Passed -> Failed): {len(comparison['regressed']):>5}"
+    yield f"  Still Failed:                 {len(comparison['still_failed']):>5}"
+    yield f"  Still Passed:                 {len(comparison['still_passed']):>5}"
+    yield f"  Skipped:                      {len(comparison['skipped']):>5}"
+    yield f"  New Tests:                    {len(comparison['new_tests']):>5}"
+    yield f"  Removed Tests:                {len(comparison['removed_tests']):>5}"
+    yield ""
 
     if summary_only:
-        lines.append("=" * 80)
-        lines.append("END OF REPORT")
-        lines.append("=" * 80)
-        return "\n".join(lines)
+        yield "=" * 80
+        yield "END OF REPORT"
+        yield "=" * 80
+        return
 
     # Fixed controls
     if comparison['fixed']:
-        lines.append("-" * 80)
-        lines.append("FIXED CONTROLS (Failed -> Passed)")
-        lines.append("-" * 80)
+        yield "-" * 80
+        yield "FIXED CONTROLS (Failed -> Passed)"
+        yield "-" * 80
         grouped = group_by_control(comparison['fixed'])
         for control_id, items in grouped.items():
-            lines.append(f"\n  [{control_id}] - {len(items)} test(s) fixed")
-            for item in items[:3]:  # Show first 3
-                title = item['pre'].get('title', item['key'])[:60]
-                lines.append(f"    - {title}")
+            yield f"\n  [{control_id}] - {len(items)} test(s) fixed"
+            for item in islice(items, 3):  # Show first 3
+                title = item.pre.title[:60]
+                yield f"    - {title}"
             if len(items) > 3:
-                lines.append(f"    ... and {len(items) - 3} more")
-        lines.append("")
+                yield f"    ... and {len(items) - 3} more"
+        yield ""
 
     # Regressed controls
     if comparison['regressed']:
-        lines.append("-" * 80)
-        lines.append("REGRESSED CONTROLS (Passed -> Failed) - ATTENTION REQUIRED")
-        lines.append("-" * 80)
+        yield "-" * 80
+        yield "REGRESSED CONTROLS (Passed -> Failed) - ATTENTION REQUIRED"
+        yield "-" * 80
         grouped = group_by_control(comparison['regressed'])
         for control_id, items in grouped.items():
-            lines.append(f"\n  [{control_id}] - {len(items)} test(s) regressed")
+            yield f"\n  [{control_id}] - {len(items)} test(s) regressed"
             for item in items:
-                title = item['pre'].get('title', item['key'])[:60]
-                lines.append(f"    - {title}")
-                if item['post'].get('found'):
-                    lines.append(f"      Found: {item['post']['found']}")
-        lines.append("")
+                title = item.pre.title[:60]
+                yield f"    - {title}"
+                if item.post.found:
+                    yield f"      Found: {item.post.found}"
+        yield ""
 
     # Still failed controls (grouped by control ID)
     if comparison['still_failed']:
-        lines.append("-" * 80)
-        lines.append("STILL FAILED CONTROLS (Require Manual Remediation)")
-        lines.append("-" * 80)
+        yield "-" * 80
+        yield "STILL FAILED CONTROLS (Require Manual Remediation)"
+        yield "-" * 80
         grouped = group_by_control(comparison['still_failed'])
         for control_id, items in grouped.items():
-            lines.append(f"\n  [{control_id}] - {len(items)} test(s) still failing")
-            for item in items[:5]:  # Show first 5
-                title = item['pre'].get('title', item['key'])[:60]
-                lines.append(f"    - {title}")
-                if item['post'].get('expected'):
-                    lines.append(f"      Expected: {item['post']['expected']}")
-                if item['post'].get('found'):
-                    lines.append(f"      Found:    {item['post']['found']}")
+            yield f"\n  [{control_id}] - {len(items)} test(s) still failing"
+            for item in islice(items, 5):  # Show first 5
+                title = item.pre.title[:60]
+                yield f"    - {title}"
+                if item.post.expected:
+                    yield f"      Expected: {item.post.expected}"
+                if item.post.found:
+                    yield f"      Found:    {item.post.found}"
             if len(items) > 5:
-                lines.append(f"    ... and {len(items) - 5} more")
-        lines.append("")
+                yield f"    ... and {len(items) - 5} more"
+        yield ""
+
+    yield "=" * 80
+    yield "END OF REPORT"
+    yield "=" * 80
 
-    lines.append("=" * 80)
-    lines.append("END OF REPORT")
-    lines.append("=" * 80)
 
-    return "\n".join(lines)
+def format_text_report(comparison, pre_summary, post_summary, pre_file, post_file, benchmark="Lockdown Goss Audit", summary_only=False, generated=None):
+    """Generate a text format report."""
+    return "\n".join(iter_text_report(comparison, pre_summary, post_summary, pre_file, post_file,
+                                      benchmark, summary_only, generated))
 
 
 # Section descriptions and criteria for report headings.
@@ -393,134 +700,143 @@ SECTION_DESCRIPTIONS = {
 }
 
 
-def format_markdown_report(comparison, pre_summary, post_summary, pre_file, post_file, benchmark="Lockdown Goss Audit", summary_only=False):
-    """Generate a Markdown format report."""
-    lines = []
-    lines.append(f"# {benchmark} Comparison Report")
-    lines.append("")
-    lines.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append("")
-    lines.append("## Files Compared")
-    lines.append("")
-    lines.append(f"- **Pre-audit:** `{pre_file}`")
-    lines.append(f"- **Post-audit:** `{post_file}`")
-    lines.append("")
+def iter_markdown_report(comparison, pre_summary, post_summary, pre_file, post_file, benchmark="Lockdown Goss Audit", summary_only=False, generated=None):
+    """Yield the lines of a Markdown format report.
+
+    ``generated`` is the report timestamp; it defaults to the current time.
+    """
+    generated = generated or datetime.now()
+    yield f"# {benchmark} Comparison Report"
+    yield ""
+    yield f"**Generated:** {generated:%Y-%m-%d %H:%M:%S}"
+    yield ""
+    yield "## Files Compared"
+    yield ""
+    yield f"- **Pre-audit:** `{pre_file}`"
+    yield f"- **Post-audit:** `{post_file}`"
+    yield ""
 
     # Summary table
-    lines.append("## Summary")
-    lines.append("")
-    lines.append(f"*{SECTION_DESCRIPTIONS['Summary']}*")
-    lines.append("")
-    lines.append("| Metric | Pre-Audit | Post-Audit | Change |")
-    lines.append("| ------ | --------: | ---------: | -----: |")
-    lines.append(f"| Total Tests | {pre_summary['total']} | {post_summary['total']} | {post_summary['total'] - pre_summary['total']:+d} |")
-    lines.append(f"| Passed | {pre_summary['passed']} | {post_summary['passed']} | {post_summary['passed'] - pre_summary['passed']:+d} |")
-    lines.append(f"| Failed | {pre_summary['failed']} | {post_summary['failed']} | {post_summary['failed'] - pre_summary['failed']:+d} |")
-    lines.append(f"| Skipped | {pre_summary['skipped']} | {post_summary['skipped']} | {post_summary['skipped'] - pre_summary['skipped']:+d} |")
-    lines.append(f"| Scan Duration | {format_duration(pre_summary['duration'])} | {format_duration(post_summary['duration'])} | |")
-    lines.append("")
+    yield "## Summary"
+    yield ""
+    yield f"*{SECTION_DESCRIPTIONS['Summary']}*"
+    yield ""
+    yield "| Metric | Pre-Audit | Post-Audit | Change |"
+    yield "| ------ | --------: | ---------: | -----: |"
+    yield f"| Total Tests | {pre_summary['total']} | {post_summary['total']} | {post_summary['total'] - pre_summary['total']:+d} |"
+    yield f"| Passed | {pre_summary['passed']} | {post_summary['passed']} | {post_summary['passed'] - pre_summary['passed']:+d} |"
+    yield f"| Failed | {pre_summary['failed']} | {post_summary['failed']} | {post_summary['failed'] - pre_summary['failed']:+d} |"
+    yield f"| Skipped | {pre_summary['skipped']} | {post_summary['skipped']} | {post_summary['skipped'] - pre_summary['skipped']:+d} |"
+    yield f"| Scan Duration | {format_duration(pre_summary['duration'])} | {format_duration(post_summary['duration'])} | |"
+    yield ""
 
     # Compliance percentage
-    pre_compliance = (pre_summary['passed'] / pre_summary['total'] * 100) if pre_summary['total'] > 0 else 0
-    post_compliance = (post_summary['passed'] / post_summary['total'] * 100) if post_summary['total'] > 0 else 0
-    lines.append(f"**Compliance Rate:** {pre_compliance:.1f}% -> {post_compliance:.1f}% ({post_compliance - pre_compliance:+.1f}%)")
-    lines.append("")
+    pre_compliance = pre_summary['compliance_rate']
+    post_compliance = post_summary['compliance_rate']
+    yield f"**Compliance Rate:** {pre_compliance:.1f}% -> {post_compliance:.1f}% ({post_compliance - pre_compliance:+.1f}%)"
+    yield ""
 
     # Changes breakdown
-    lines.append("## Changes Breakdown")
-    lines.append("")
-    lines.append(f"*{SECTION_DESCRIPTIONS['Changes Breakdown']}*")
-    lines.append("")
-    lines.append(f"- **Fixed** (Failed -> Passed): {len(comparison['fixed'])}")
-    lines.append(f"- **Regressed** (Passed -> Failed): {len(comparison['regressed'])}")
-    lines.append(f"- **Still Failed**: {len(comparison['still_failed'])}")
-    lines.append(f"- **Still Passed**: {len(comparison['still_passed'])}")
-    lines.append(f"- **Skipped**: {len(comparison['skipped'])}")
-    lines.append("")
+    yield "## Changes Breakdown"
+    yield ""
+    yield f"*{SECTION_DESCRIPTIONS['Changes Breakdown']}*"
+    yield ""
+    yield f"- **Fixed** (Failed -> Passed): {len(comparison['fixed'])}"
+    yield f"- **Regressed** (Passed -> Failed): {len(comparison['regressed'])}"
+    yield f"- **Still Failed**: {len(comparison['still_failed'])}"
+    yield f"- **Still Passed**: {len(comparison['still_passed'])}"
+    yield f"- **Skipped**: {len(comparison['skipped'])}"
+    yield ""
 
     if summary_only:
-        return "\n".join(lines)
+        return
 
     # Fixed controls
     if comparison['fixed']:
-        lines.append("## Fixed Controls")
-        lines.append("")
-        lines.append(f"> {SECTION_DESCRIPTIONS['Fixed Controls']}")
-        lines.append("")
+        yield "## Fixed Controls"
+        yield ""
+        yield f"> {SECTION_DESCRIPTIONS['Fixed Controls']}"
+        yield ""
         grouped = group_by_control(comparison['fixed'])
         for control_id, items in grouped.items():
-            lines.append(f"### {control_id}")
-            lines.append("")
+            yield f"### {control_id}"
+            yield ""
             for item in items:
-                title = item['pre'].get('title', item['key'])
-                lines.append(f"- {title}")
-            lines.append("")
+                title = item.pre.title
+                yield f"- {title}"
+            yield ""
 
     # Regressed controls
     if comparison['regressed']:
-        lines.append("## Regressed Controls")
-        lines.append("")
-        lines.append(f"> **Warning:** {SECTION_DESCRIPTIONS['Regressed Controls']}")
-        lines.append("")
+        yield "## Regressed Controls"
+        yield ""
+        yield f"> **Warning:** {SECTION_DESCRIPTIONS['Regressed Controls']}"
+        yield ""
         grouped = group_by_control(comparison['regressed'])
         for control_id, items in grouped.items():
-            lines.append(f"### {control_id}")
-            lines.append("")
+            yield f"### {control_id}"
+            yield ""
             for item in items:
-                title = item['pre'].get('title', item['key'])
-                lines.append(f"- {title}")
-                if item['post'].get('found'):
-                    lines.append(f"  - Found: `{item['post']['found']}`")
-            lines.append("")
+                title = item.pre.title
+                yield f"- {title}"
+                if item.post.found:
+                    yield f"  - Found: `{item.post.found}`"
+            yield ""
 
     # Still failed
     if comparison['still_failed']:
-        lines.append("## Still Failed Controls")
-        lines.append("")
-        lines.append(f"> {SECTION_DESCRIPTIONS['Still Failed Controls']}")
-        lines.append("")
+        yield "## Still Failed Controls"
+        yield ""
+        yield f"> {SECTION_DESCRIPTIONS['Still Failed Controls']}"
+        yield ""
         grouped = group_by_control(comparison['still_failed'])
         for control_id, items in grouped.items():
-            lines.append(f"### {control_id} ({len(items)} tests)")
-            lines.append("")
-            for item in items[:10]:
-                title = item['pre'].get('title', item['key'])
-                lines.append(f"- {title}")
-                if item['post'].get('expected'):
-                    lines.append(f"  - Expected: `{item['post']['expected']}`")
-                if item['post'].get('found'):
-                    lines.append(f"  - Found: `{item['post']['found']}`")
+            yield f"### {control_id} ({len(items)} tests)"
+            yield ""
+            for item in islice(items, 10):
+                title = item.pre.title
+                yield f"- {title}"
+                if item.post.expected:
+                    yield f"  - Expected: `{item.post.expected}`"
+                if item.post.found:
+                    yield f"  - Found: `{item.post.found}`"
             if len(items) > 10:
-                lines.append(f"- *... and {len(items) - 10} more*")
-            lines.append("")
+                yield f"- *... and {len(items) - 10} more*"
+            yield ""
 
-    lines.append("---")
-    lines.append("")
-    lines.append(
+    yield "---"
+    yield ""
+    yield (
         f"*Generated by audit_compare.py v{VERSION} "
-        f"for {benchmark} on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*"
+        f"for {benchmark} on {generated:%Y-%m-%d %H:%M:%S}*"
     )
-    lines.append("")
+    yield ""
+
 
-    return "\n".join(lines)
+def format_markdown_report(comparison, pre_summary, post_summary, pre_file, post_file, benchmark="Lockdown Goss Audit", summary_only=False, generated=None):
+    """Generate a Markdown format report."""
+    return "\n".join(iter_markdown_report(comparison, pre_summary, post_summary, pre_file, post_file,
+                                          benchmark, summary_only, generated))
 
 
-def format_json_report(comparison, pre_summary, post_summary, pre_file, post_file, benchmark="Lockdown Goss Audit", summary_only=False):
+def format_json_report(comparison, pre_summary, post_summary, pre_file, post_file, benchmark="Lockdown Goss Audit", summary_only=False, generated=None):
     """Generate a JSON format report."""
+    generated = generated or datetime.now()
     report = {
         'metadata': {
-            'generated': datetime.now().isoformat(),
+            'generated': generated.isoformat(),
             'tool_version': f"audit_compare.py v{VERSION}",
             'benchmark': benchmark,
             'pre_audit_file': str(pre_file),
             'post_audit_file': str(post_file),
         },
         'summary': {
-            'pre_audit': pre_summary,
-            'post_audit': post_summary,
+            # compliance_rate is published as compliance_change, not per audit
+            'pre_audit': {k: v for k, v in pre_summary.items() if k != 'compliance_rate'},
+            'post_audit': {k: v for k, v in post_summary.items() if k != 'compliance_rate'},
             'compliance_change': {
-                'pre': (pre_summary['passed'] / pre_summary['total'] * 100) if pre_summary['total'] > 0 else 0,
-                'post': (post_summary['passed'] / post_summary['total'] * 100) if post_summary['total'] > 0 else 0,
+                'pre': pre_summary['compliance_rate'],
+                'post': post_summary['compliance_rate'],
             },
             'duration': {
                 'pre_nanoseconds': pre_summary['duration'],
@@ -539,21 +855,23 @@ def format_json_report(comparison, pre_summary, post_summary, pre_file, post_fil
         'section_descriptions': SECTION_DESCRIPTIONS,
     }
     if not summary_only:
-        report['fixed'] = [{'control_id': i.get('pre', {}).get('control_id', ''), 'title': i.get('pre', {}).get('title', '')} for i in comparison['fixed']]
-        report['regressed'] = [{'control_id': i.get('pre', {}).get('control_id', ''), 'title': i.get('pre', {}).get('title', '')} for i in comparison['regressed']]
+        # Fixed, regressed and still-failed items always carry both pre and post
+        # records (see compare_audits).
+        report['fixed'] = [{'control_id': i.pre.control_id, 'title': i.pre.title} for i in comparison['fixed']]
+        report['regressed'] = [{'control_id': i.pre.control_id, 'title': i.pre.title} for i in comparison['regressed']]
         report['still_failed_by_control'] = {
             control_id: [
                 {
-                    'title': item.get('pre', {}).get('title', ''),
-                    'summary_line': item.get('post', {}).get('summary_line', ''),
-                    'expected': item.get('post', {}).get('expected', []),
-                    'found': item.get('post', {}).get('found', []),
+                    'title': item.pre.title,
+                    'summary_line': item.post.summary_line,
+                    'expected': item.post.expected,
+                    'found': item.post.found,
                 }
                 for item in items
             ]
             for control_id, items in group_by_control(comparison['still_failed']).items()
         }
-    return json.dumps(report, indent=2)
+    return _json_dumps_indented(report)
 
 
 # ---------------------------------------------------------------------------
@@ -814,23 +1132,96 @@ FORMAT_EXTENSIONS = {
 }
 
 
-def generate_default_filename(benchmark, version, fmt):
+def generate_default_filename(benchmark, version, fmt, generated=None):
     """Generate default report filename.
 
     Pattern: audit_compare_report_{benchmark}_{version}_{datetime}.{ext}
     Example: audit_compare_report_RHEL10_CIS_v1_0_0_2026-02-28_143012.md
+
+    ``generated`` is the timestamp to embed; it defaults to the current time.
     """
     # Sanitize benchmark for filename: replace spaces/special chars with underscores
-    safe_name = re.sub(r'[^a-zA-Z0-9_-]', '_', benchmark)
-    safe_version = re.sub(r'[^a-zA-Z0-9_.-]', '_', version) if version else 'unknown'
-    timestamp = datetime.now().strftime('%Y-%m-%d_%H%M%S')
+    safe_name = UNSAFE_NAME_CHARS_RE.sub('_', benchmark)
+    safe_version = UNSAFE_VERSION_CHARS_RE.sub('_', version) if version else 'unknown'
+    timestamp = (generated or datetime.now()).strftime('%Y-%m-%d_%H%M%S')
     ext = FORMAT_EXTENSIONS.get(fmt, '.txt')
     return f"audit_compare_report_{safe_name}_{safe_version}_{timestamp}{ext}"
 
 
+# Buffer size for report files; large reports reach disk in few big writes.
+# A single large chunk (HTML/JSON) is encoded once and bypasses the buffer,
+# which measured faster than encoding by hand and looping over os.write().
+REPORT_WRITE_BUFFER = 1 << 20
+
+
+def write_report_lines(lines, fh):
+    """Write report lines separated by newlines, as "\\n".join() would.
+
+    Lets main() stream the iter_*_report generators straight to the output
+    handle without first materializing the whole report string.
+    """
+    lines = iter(lines)
+    for first in lines:
+        fh.write(first)
+        fh.writelines("\n" + line for line in lines)
+
+
+def write_report_file(lines, output_path):
+    """Write report lines to output_path without exposing a partial report.
+
+    A missing or regular (non-symlink) target is written to a temp file
+    beside it and renamed over it. Anything else (a symlink, /dev/stdout,
+    a FIFO), or a target in a directory that does not allow new files,
+    is written in place.
+    """
+    try:
+        st = os.lstat(output_path)
+    except FileNotFoundError:
+        st = None
+    tmp_dir = os.path.dirname(os.path.realpath(output_path))
+    if not ((st is None or stat.S_ISREG(st.st_mode))
+            and os.access(tmp_dir, os.W_OK | os.X_OK)):
+        with open(output_path, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as f:
+            write_report_lines(lines, f)
+        return
+
+    # mkstemp creates files 0600; give the report the mode open() would have
+    if st is not None:
+        mode = stat.S_IMODE(st.st_mode)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    tmp_name = None
+    try:
+        with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER, delete=False,
+                dir=tmp_dir, prefix=f".{os.path.basename(output_path)}.", suffix='.tmp') as tmp:
+            tmp_name = tmp.name
+            write_report_lines(lines, tmp)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        if tmp_name is not None:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_name)
+        raise
+
+
+_html_escape = html_mod.escape
+
+
 def _esc(text):
-    """HTML-escape dynamic content."""
-    return html_mod.escape(str(text))
+    """HTML-escape dynamic content.
+
+    Strings skip the str() round-trip, and numbers (which cannot contain
+    markup) are only stringified.
+    """
+    if isinstance(text, str):
+        return _html_escape(text)
+    if isinstance(text, (int, float)):
+        return str(text)
+    return _html_escape(str(text))
 
 
 def _change_class(value):
@@ -846,13 +1237,40 @@ def _build_search_text(control_id, items, key_field='pre'):
     """Build search text for a control group (control_id + all titles)."""
     parts = [control_id]
     for item in items:
-        src = item.get(key_field) or item.get('post') or item.get('pre') or {}
-        parts.append(src.get('title', ''))
+        src = getattr(item, key_field) or item.post or item.pre
+        parts.append(src.title)
     return ' '.join(parts)
 
 
-def format_html_report(comparison, pre_summary, post_summary, pre_file, post_file, benchmark="Lockdown Goss Audit", summary_only=False):
+def _failing_controls_html(items, details_tag, verb):
+    """Render one <details> block per control for failing post-audit items.
+
+    Shared by the regressed and still-failed sections, which differ only in
+    the opening tag (``details open`` vs ``details``) and the summary verb.
+    Each test lists its post-audit expected/found values when present.
+    """
+    control_parts = []
+    for control_id, group in group_by_control(items).items():
+        search_text = _esc(_build_search_text(control_id, group))
+        test_parts = []
+        for item in group:
+            test_parts.append(f"<li>{_esc(item.pre.title)}")
+            if item.post.expected:
+                test_parts.append(f"<br><span class='expected-found'>Expected: <code>{_esc(item.post.expected)}</code></span>")
+            if item.post.found:
+                test_parts.append(f"<br><span class='expected-found'>Found: <code>{_esc(item.post.found)}</code></span>")
+            test_parts.append("</li>\n")
+        control_parts.append(
+            f"<{details_tag} data-search-text='{search_text}'>"
+            f"<summary>[{_esc(control_id)}] &mdash; "
+            f"{len(group)} test(s) {verb}</summary>\n"
+            f"<ul>{''.join(test_parts)}</ul></details>\n")
+    return "".join(control_parts)
+
+
+def format_html_report(comparison, pre_summary, post_summary, pre_file, post_file, benchmark="Lockdown Goss Audit", summary_only=False, generated=None):
     """Generate an interactive HTML format report."""
+    generated_str = _esc((generated or datetime.now()).strftime('%Y-%m-%d %H:%M:%S'))
     sections = []
 
     # --- Toolbar ---
@@ -862,13 +1280,12 @@ def format_html_report(comparison, pre_summary, post_summary, pre_file, post_fil
         ("regressed", "badge-regressed", "Regressed"),
         ("still_failed", "badge-still-failed", "Still Failed"),
     ]
-    filter_btns = ""
-    for cat, badge_cls, label in filter_cats:
-        count = len(comparison[cat])
-        if count > 0:
-            filter_btns += (
-                f"    <button class='filter-btn {badge_cls}' data-cat='{cat}'>"
-                f"{_esc(label)} ({count})</button>\n")
+    filter_btns = "".join(
+        f"    <button class='filter-btn {badge_cls}' data-cat='{cat}'>"
+        f"{_esc(label)} ({len(comparison[cat])})</button>\n"
+        for cat, badge_cls, label in filter_cats
+        if comparison[cat]
+    )
 
     toolbar = (
         "<div class='toolbar no-print' id='toolbar'>\n"
@@ -890,8 +1307,8 @@ def format_html_report(comparison, pre_summary, post_summary, pre_file, post_fil
     sections.append(toolbar)
 
     # --- Summary table ---
-    pre_compliance = (pre_summary['passed'] / pre_summary['total'] * 100) if pre_summary['total'] > 0 else 0
-    post_compliance = (post_summary['passed'] / post_summary['total'] * 100) if post_summary['total'] > 0 else 0
+    pre_compliance = pre_summary['compliance_rate']
+    post_compliance = post_summary['compliance_rate']
     compliance_change = post_compliance - pre_compliance
 
     def _summary_row(label, pre_val, post_val, change=None, is_pct=False):
@@ -909,21 +1326,22 @@ def format_html_report(comparison, pre_summary, post_summary, pre_file, post_fil
                 f"<td class='num'>{post_str}</td>"
                 f"<td class='num {chg_cls}'>{chg_str}</td></tr>\n")
 
-    summary_rows = ""
-    summary_rows += _summary_row("Total Tests", pre_summary['total'], post_summary['total'],
-                                 post_summary['total'] - pre_summary['total'])
-    summary_rows += _summary_row("Passed", pre_summary['passed'], post_summary['passed'],
-                                 post_summary['passed'] - pre_summary['passed'])
-    summary_rows += _summary_row("Failed", pre_summary['failed'], post_summary['failed'],
-                                 post_summary['failed'] - pre_summary['failed'])
-    summary_rows += _summary_row("Skipped", pre_summary['skipped'], post_summary['skipped'],
-                                 post_summary['skipped'] - pre_summary['skipped'])
-    summary_rows += (f"<tr><td>Scan Duration</td>"
-                     f"<td class='num'>{_esc(format_duration(pre_summary['duration']))}</td>"
-                     f"<td class='num'>{_esc(format_duration(post_summary['duration']))}</td>"
-                     f"<td class='num'></td></tr>\n")
-    summary_rows += _summary_row("Compliance Rate", pre_compliance, post_compliance,
-                                 compliance_change, is_pct=True)
+    summary_rows = "".join((
+        _summary_row("Total Tests", pre_summary['total'], post_summary['total'],
+                     post_summary['total'] - pre_summary['total']),
+        _summary_row("Passed", pre_summary['passed'], post_summary['passed'],
+                     post_summary['passed'] - pre_summary['passed']),
+        _summary_row("Failed", pre_summary['failed'], post_summary['failed'],
+                     post_summary['failed'] - pre_summary['failed']),
+        _summary_row("Skipped", pre_summary['skipped'], post_summary['skipped'],
+                     post_summary['skipped'] - pre_summary['skipped']),
+        (f"<tr><td>Scan Duration</td>"
+         f"<td class='num'>{_esc(format_duration(pre_summary['duration']))}</td>"
+         f"<td class='num'>{_esc(format_duration(post_summary['duration']))}</td>"
+         f"<td class='num'></td></tr>\n"),
+        _summary_row("Compliance Rate", pre_compliance, post_compliance,
+                     compliance_change, is_pct=True),
+    ))
 
     sections.append(
         f"<div class='section' id='section-summary'>\n<h2>Summary</h2>\n"
@@ -944,11 +1362,11 @@ def format_html_report(comparison, pre_summary, post_summary, pre_file, post_fil
         ("New Tests", len(comparison['new_tests']), "badge-new", ""),
         ("Removed Tests", len(comparison['removed_tests']), "badge-removed", ""),
     ]
-    breakdown_html = ""
-    for label, count, badge_cls, target_id in breakdown_items:
-        row_attrs = f" data-target='{target_id}' class='clickable-row'" if target_id and count > 0 else ""
-        breakdown_html += (f"<tr{row_attrs}><td>{label}</td>"
-                           f"<td class='num'><span class='badge {badge_cls}'>{count}</span></td></tr>\n")
+    breakdown_html = "".join(
+        (f"<tr data-target='{target_id}' class='clickable-row'>" if target_id and count > 0 else "<tr>")
+        + f"<td>{label}</td><td class='num'><span class='badge {badge_cls}'>{count}</span></td></tr>\n"
+        for label, count, badge_cls, target_id in breakdown_items
+    )
     sections.append(
         f"<div class='section' id='section-breakdown'>\n<h2>Changes Breakdown</h2>\n"
         f"<p style='font-size:0.85rem;color:#6c757d;font-style:italic;margin:0.25rem 0 0.75rem'>"
@@ -960,7 +1378,7 @@ def format_html_report(comparison, pre_summary, post_summary, pre_file, post_fil
         title = f"{_esc(benchmark)} Comparison Report"
         return HTML_TEMPLATE.format(
             title=title,
-            generated=_esc(datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+            generated=generated_str,
             pre_file=_esc(pre_file),
             post_file=_esc(post_file),
             content="\n".join(sections),
@@ -971,18 +1389,19 @@ def format_html_report(comparison, pre_summary, post_summary, pre_file, post_fil
     # --- Fixed controls ---
     if comparison['fixed']:
         grouped = group_by_control(comparison['fixed'])
-        controls_html = ""
+        control_parts = []
         for control_id, items in grouped.items():
             search_text = _esc(_build_search_text(control_id, items))
             test_list = "".join(
-                f"<li>{_esc(item['pre'].get('title', item['key']))}</li>\n"
+                f"<li>{_esc(item.pre.title)}</li>\n"
                 for item in items
             )
-            controls_html += (
+            control_parts.append(
                 f"<details data-search-text='{search_text}'>"
                 f"<summary>[{_esc(control_id)}] &mdash; "
                 f"{len(items)} test(s) fixed</summary>\n"
                 f"<ul>{test_list}</ul></details>\n")
+        controls_html = "".join(control_parts)
         sections.append(
             f"<div class='section' id='section-fixed' data-category='fixed'>\n"
             f"<div class='section-header'><h2>Fixed Controls</h2>"
@@ -995,24 +1414,7 @@ def format_html_report(comparison, pre_summary, post_summary, pre_file, post_fil
 
     # --- Regressed controls ---
     if comparison['regressed']:
-        grouped = group_by_control(comparison['regressed'])
-        controls_html = ""
-        for control_id, items in grouped.items():
-            search_text = _esc(_build_search_text(control_id, items))
-            test_lines = ""
-            for item in items:
-                title = _esc(item['pre'].get('title', item['key']))
-                test_lines += f"<li>{title}"
-                if item['post'].get('expected'):
-                    test_lines += f"<br><span class='expected-found'>Expected: <code>{_esc(item['post']['expected'])}</code></span>"
-                if item['post'].get('found'):
-                    test_lines += f"<br><span class='expected-found'>Found: <code>{_esc(item['post']['found'])}</code></span>"
-                test_lines += "</li>\n"
-            controls_html += (
-                f"<details open data-search-text='{search_text}'>"
-                f"<summary>[{_esc(control_id)}] &mdash; "
-                f"{len(items)} test(s) regressed</summary>\n"
-                f"<ul>{test_lines}</ul></details>\n")
+        controls_html = _failing_controls_html(comparison['regressed'], "details open", "regressed")
         sections.append(
             f"<div class='section' id='section-regressed' data-category='regressed'>\n"
             f"<div class='warning-banner'>Regressed Controls &mdash; Passed &rarr; Failed</div>\n"
@@ -1026,24 +1428,7 @@ def format_html_report(comparison, pre_summary, post_summary, pre_file, post_fil
 
     # --- Still failed controls ---
     if comparison['still_failed']:
-        grouped = group_by_control(comparison['still_failed'])
-        controls_html = ""
-        for control_id, items in grouped.items():
-            search_text = _esc(_build_search_text(control_id, items))
-            test_lines = ""
-            for item in items:
-                title = _esc(item['pre'].get('title', item['key']))
-                test_lines += f"<li>{title}"
-                if item['post'].get('expected'):
-                    test_lines += f"<br><span class='expected-found'>Expected: <code>{_esc(item['post']['expected'])}</code></span>"
-                if item['post'].get('found'):
-                    test_lines += f"<br><span class='expected-found'>Found: <code>{_esc(item['post']['found'])}</code></span>"
-                test_lines += "</li>\n"
-            controls_html += (
-                f"<details data-search-text='{search_text}'>"
-                f"<summary>[{_esc(control_id)}] &mdash; "
-                f"{len(items)} test(s) still failing</summary>\n"
-                f"<ul>{test_lines}</ul></details>\n")
+        controls_html = _failing_controls_html(comparison['still_failed'], "details", "still failing")
         sections.append(
             f"<div class='section' id='section-still-failed' data-category='still_failed'>\n"
             f"<div class='section-header'><h2>Still Failed Controls</h2>"
@@ -1057,7 +1442,7 @@ def format_html_report(comparison, pre_summary, post_summary, pre_file, post_fil
     title = f"{_esc(benchmark)} Comparison Report"
     return HTML_TEMPLATE.format(
         title=title,
-        generated=_esc(datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+        generated=generated_str,
         pre_file=_esc(pre_file),
         post_file=_esc(post_file),
         content="\n".join(sections),
@@ -1066,6 +1451,16 @@ def format_html_report(comparison, pre_summary, post_summary, pre_file, post_fil
     )
 
 
+# Format name -> function returning the report as an iterable of lines. All
+# share one signature; HTML and JSON are produced as a single chunk.
+REPORT_FORMATTERS = {
+    'text': iter_text_report,
+    'markdown': iter_markdown_report,
+    'html': lambda *args, **kwargs: (format_html_report(*args, **kwargs),),
+    'json': lambda *args, **kwargs: (format_json_report(*args, **kwargs),),
+}
+
+
 # ---------------------------------------------------------------------------
 # Web UI (--serve)
 # ---------------------------------------------------------------------------
@@ -1294,6 +1689,25 @@ loadFiles();
 </html>
 """
 
+# The index page never changes, so encode it once rather than per request.
+WEB_UI_HTML_BYTES = WEB_UI_HTML.encode('utf-8')
+
+# Response bodies above LARGE_BODY_THRESHOLD are streamed in SEND_CHUNK_SIZE slices
+LARGE_BODY_THRESHOLD = 1 << 20
+SEND_CHUNK_SIZE = 1 << 16
+
+
+@functools.lru_cache(maxsize=8)
+def _load_audit_cached(filepath, mtime_ns):
+    """Parse an audit file and extract its results and summary.
+
+    Memoized on (path, mtime_ns) so the web UI can re-run comparisons
+    against the same files without re-parsing them; a modified file gets
+    a new mtime and therefore a fresh entry. Callers must not mutate the
+    returned structures.
+    """
+    return parse_audit_file(filepath)
+
 
 class AuditCompareHandler(http.server.BaseHTTPRequestHandler):
     """HTTP request handler for the audit comparison web UI."""
@@ -1321,7 +1735,7 @@ class AuditCompareHandler(http.server.BaseHTTPRequestHandler):
 
     def _serve_index(self):
         """Serve the single-page application."""
-        self._send_html(WEB_UI_HTML)
+        self._send_bytes(WEB_UI_HTML_BYTES, 'text/html; charset=utf-8')
 
     def _serve_api_files(self, params):
         """List JSON files in a directory."""
@@ -1342,7 +1756,7 @@ class AuditCompareHandler(http.server.BaseHTTPRequestHandler):
                 filepath = os.path.join(validated, name)
                 if not os.path.isfile(filepath):
                     continue
-                stat = os.stat(filepath)
+                st = os.stat(filepath)
                 # Infer pre/post from filename
                 name_lower = name.lower()
                 file_type = None
@@ -1353,8 +1767,8 @@ class AuditCompareHandler(http.server.BaseHTTPRequestHandler):
                 files.append({
                     'name': name,
                     'path': filepath,
-                    'size': stat.st_size,
-                    'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    'size': st.st_size,
+                    'modified': datetime.fromtimestamp(st.st_mtime).isoformat(),
                     'type': file_type,
                 })
         except OSError as e:
@@ -1376,22 +1790,18 @@ class AuditCompareHandler(http.server.BaseHTTPRequestHandler):
             return
 
         try:
-            pre_data = json.loads(Path(pre_validated).read_text())
-            post_data = json.loads(Path(post_validated).read_text())
-        except (json.JSONDecodeError, OSError) as e:
+            pre_results, pre_summary = self._load_audit(pre_validated)
+            post_results, post_summary = self._load_audit(post_validated)
+        except (ValueError, OSError) as e:
             self._send_json({'error': f'Failed to load audit file: {e}'}, 400)
             return
 
-        pre_results = extract_results(pre_data)
-        post_results = extract_results(post_data)
-        pre_summary = extract_summary(pre_data)
-        post_summary = extract_summary(post_data)
         comparison = compare_audits(pre_results, post_results)
         benchmark = title or detect_benchmark_name(pre_path, post_path)
 
         report = format_json_report(comparison, pre_summary, post_summary,
                                     pre_path, post_path, benchmark)
-        self._send_json(json.loads(report))
+        self._send_bytes(report.encode('utf-8'), 'application/json')
 
     def _serve_api_report(self, params):
         """Generate formatted report and return it."""
@@ -1407,28 +1817,29 @@ class AuditCompareHandler(http.server.BaseHTTPRequestHandler):
             return
 
         try:
-            pre_data = json.loads(Path(pre_validated).read_text())
-            post_data = json.loads(Path(post_validated).read_text())
-        except (json.JSONDecodeError, OSError) as e:
+            pre_results, pre_summary = self._load_audit(pre_validated)
+            post_results, post_summary = self._load_audit(post_validated)
+        except (ValueError, OSError) as e:
             self._send_json({'error': f'Failed to load audit file: {e}'}, 400)
             return
 
-        pre_results = extract_results(pre_data)
-        post_results = extract_results(post_data)
-        pre_summary = extract_summary(pre_data)
-        post_summary = extract_summary(post_data)
         comparison = compare_audits(pre_results, post_results)
         benchmark = title or detect_benchmark_name(pre_path, post_path)
 
         if fmt == 'json':
             report = format_json_report(comparison, pre_summary, post_summary,
                                         pre_path, post_path, benchmark)
-            self._send_json(json.loads(report))
+            self._send_bytes(report.encode('utf-8'), 'application/json')
         else:
             report = format_html_report(comparison, pre_summary, post_summary,
                                         pre_path, post_path, benchmark)
             self._send_html(report)
 
+    @staticmethod
+    def _load_audit(filepath):
+        """Return (results, summary) for an audit file, reusing cached parses."""
+        return _load_audit_cached(filepath, os.stat(filepath).st_mtime_ns)
+
     def _validate_path(self, filepath, must_be_file=True):
         """Validate and resolve a file path to prevent directory traversal."""
         if not filepath:
@@ -1444,23 +1855,30 @@ class AuditCompareHandler(http.server.BaseHTTPRequestHandler):
             return None
         return resolved
 
-    def _send_json(self, data, status=200):
-        """Send a JSON response."""
-        body = json.dumps(data, indent=2).encode('utf-8')
+    def _send_bytes(self, body, content_type, status=200):
+        """Send a pre-encoded response body.
+
+        Multi-MB reports are written in SEND_CHUNK_SIZE slices of a
+        memoryview so no copies are made and the socket drains steadily.
+        """
         self.send_response(status)
-        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Type', content_type)
         self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(body)
+        if len(body) <= LARGE_BODY_THRESHOLD:
+            self.wfile.write(body)
+            return
+        view = memoryview(body)
+        for offset in range(0, len(view), SEND_CHUNK_SIZE):
+            self.wfile.write(view[offset:offset + SEND_CHUNK_SIZE])
+
+    def _send_json(self, data, status=200):
+        """Send a JSON response."""
+        self._send_bytes(json.dumps(data, indent=2).encode('utf-8'), 'application/json', status)
 
     def _send_html(self, content, status=200):
         """Send an HTML response."""
-        body = content.encode('utf-8')
-        self.send_response(status)
-        self.send_header('Content-Type', 'text/html; charset=utf-8')
-        self.send_header('Content-Length', str(len(body)))
-        self.end_headers()
-        self.wfile.write(body)
+        self._send_bytes(content.encode('utf-8'), 'text/html; charset=utf-8', status)
 
     def _send_error(self, status, message):
         """Send an error response."""
@@ -1496,7 +1914,9 @@ def serve_web_ui(port, base_dir=None):
         server.shutdown()
 
 
-def main():
+@functools.lru_cache(maxsize=1)
+def build_parser():
+    """Build the CLI argument parser (constructed once per process)."""
     parser = argparse.ArgumentParser(
         description='Compare pre and post remediation Lockdown Goss Audit results',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1508,6 +1928,7 @@ Examples:
     %(prog)s pre_audit.json post_audit.json --no-report
     %(prog)s pre_audit.json post_audit.json --no-report --format json > out.json
     %(prog)s pre_audit.json post_audit.json --summary-only --no-report
+    %(prog)s pre_audit.json post_audit.json --strict --no-report --only-on-failure
     %(prog)s --serve 9090
         """
     )
@@ -1525,9 +1946,18 @@ Examples:
                         help='Print to stdout only, do not write a report file')
     parser.add_argument('--summary-only', action='store_true',
                         help='Show only summary and changes breakdown, skip control details')
+    parser.add_argument('--only-on-failure', action='store_true',
+                        help='Skip report generation when the comparison passes (exit code only)')
+    parser.add_argument('--cache', metavar='PATH',
+                        help='JSON file caching parsed audit results; unchanged audits '
+                             'are not re-parsed on later runs')
     parser.add_argument('--serve', nargs='?', const=9090, type=int, metavar='PORT',
                         help='Launch web UI on PORT (default: 9090)')
+    return parser
 
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
 
     # Web UI mode
@@ -1539,51 +1969,54 @@ Examples:
     if not args.pre_audit or not args.post_audit:
         parser.error('pre_audit and post_audit are required (unless using --serve)')
 
-    # Load audit files
-    pre_data = load_audit_file(args.pre_audit)
-    post_data = load_audit_file(args.post_audit)
-
-    # Extract results and summaries
-    pre_results = extract_results(pre_data)
-    post_results = extract_results(post_data)
-    pre_summary = extract_summary(pre_data)
-    post_summary = extract_summary(post_data)
+    # Load audit files and extract results and summaries
+    # (independent, so both files are read and parsed concurrently)
+    cache = _load_audit_cache(args.cache) if args.cache else {}
+    new_cache = {} if args.cache else None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        pre_future = pool.submit(load_audit_results, args.pre_audit, cache, new_cache)
+        post_future = pool.submit(load_audit_results, args.post_audit, cache, new_cache)
+        pre_results, pre_summary = pre_future.result()
+        post_results, post_summary = post_future.result()
+    # Rewrite the cache only if an audit was re-parsed or an entry dropped
+    if args.cache and (len(new_cache) != len(cache) or any(
+            entry is not cache.get(path) for path, entry in new_cache.items())):
+        _save_audit_cache(args.cache, new_cache)
 
     # Compare audits
     comparison = compare_audits(pre_results, post_results)
 
-    # Resolve benchmark title and version
-    benchmark = args.title if args.title else detect_benchmark_name(args.pre_audit, args.post_audit)
-    version = detect_benchmark_version(args.pre_audit, args.post_audit)
-
-    # Generate report
-    so = args.summary_only
-    if args.format == 'text':
-        report = format_text_report(comparison, pre_summary, post_summary,
-                                    args.pre_audit, args.post_audit, benchmark, summary_only=so)
-    elif args.format == 'markdown':
-        report = format_markdown_report(comparison, pre_summary, post_summary,
-                                        args.pre_audit, args.post_audit, benchmark, summary_only=so)
-    elif args.format == 'html':
-        report = format_html_report(comparison, pre_summary, post_summary,
-                                    args.pre_audit, args.post_audit, benchmark, summary_only=so)
-    else:
-        report = format_json_report(comparison, pre_summary, post_summary,
-                                    args.pre_audit, args.post_audit, benchmark, summary_only=so)
+    # Exit codes: 0 = no regressions, 1 = regressions (or still-failed in strict mode), 2 = input error
+    failed = bool(comparison['regressed']) or (args.strict and bool(comparison['still_failed']))
+    if args.only_on_failure and not failed:
+        print("No regressions detected; report skipped (--only-on-failure)", file=sys.stderr)
+        return
+
+    # Resolve benchmark title and version (the version only names the default
+    # output file), detecting both from the filenames in one pass if needed
+    needs_version = not args.no_report and not args.output
+    benchmark, version = args.title, None
+    if not benchmark or needs_version:
+        detected_name, version = detect_benchmark(args.pre_audit, args.post_audit)
+        benchmark = benchmark or detected_name
+
+    # Generate report (text and Markdown are streamed line by line). One
+    # timestamp is shared by the report body and the default filename.
+    generated = datetime.now()
+    report_lines = REPORT_FORMATTERS[args.format](
+        comparison, pre_summary, post_summary, args.pre_audit, args.post_audit,
+        benchmark, summary_only=args.summary_only, generated=generated)
 
     # Output report
     if args.no_report:
-        print(report)
+        write_report_lines(report_lines, sys.stdout)
+        sys.stdout.write("\n")
     else:
-        output_path = args.output if args.output else generate_default_filename(benchmark, version, args.format)
-        with open(output_path, 'w') as f:
-            f.write(report)
+        output_path = args.output or generate_default_filename(benchmark, version, args.format, generated)
+        write_report_file(report_lines, output_path)
         print(f"Report written to: {output_path}", file=sys.stderr)
 
-    # Exit codes: 0 = no regressions, 1 = regressions (or still-failed in strict mode), 2 = input error
-    if comparison['regressed']:
-        sys.exit(1)
-    if args.strict and comparison['still_failed']:
+    if failed:
         sys.exit(1)
 
 
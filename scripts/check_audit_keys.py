@@ -12,6 +12,7 @@ Usage:
 """
 
 import argparse
+import concurrent.futures
 import os
 import re
 import sys
@@ -25,6 +26,25 @@ AUDIT_TEMPLATE_PATTERNS = [
 ]
 
 
+def iter_files(top):
+    """Yield every non-directory DirEntry under top, as os.walk would (unsorted)."""
+    stack = [top]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        yield entry
+                    elif not entry.is_symlink():
+                        stack.append(entry.path)
+        except OSError:
+            continue
+
+
 def find_audit_templates(repo_path, extra_patterns=None):
     """Find audit variable templates in the repo."""
     patterns = AUDIT_TEMPLATE_PATTERNS + (extra_patterns or [])
@@ -34,72 +54,80 @@ def find_audit_templates(repo_path, extra_patterns=None):
     if not os.path.isdir(templates_dir):
         return templates
 
-    for root, _, files in os.walk(templates_dir):
-        for f in files:
-            if not f.endswith('.j2'):
-                continue
-            for pattern in patterns:
-                if pattern.match(f):
-                    templates.append(os.path.join(root, f))
-                    break
+    for entry in iter_files(templates_dir):
+        if not entry.name.endswith('.j2'):
+            continue
+        for pattern in patterns:
+            if pattern.match(entry.name):
+                templates.append(entry.path)
+                break
 
     return sorted(templates)
 
 
+# YAML key at the start of a line: (indent)(key)<spaces>: plus the rest of the
+# line. [^\S\n] is whitespace other than newline, so matches never span lines.
+KEY_LINE_RE = re.compile(r'^([^\S\n]*)(\w[\w.-]*)[^\S\n]*:.*', re.MULTILINE)
+# Jinja2 loop tags; group 1 is set for endfor
+LOOP_TAG_RE = re.compile(r'\{%-?\s*(end)?for\b')
+
+
 def extract_keys(filepath):
-    """Extract YAML keys with their indentation level and line number."""
+    """Extract YAML keys outside for-loops with their indentation and line number.
+
+    The template is scanned whole with KEY_LINE_RE and LOOP_TAG_RE rather
+    than line by line. Lines holding a Jinja2 ``for``/``endfor`` tag adjust
+    the loop depth and are not themselves reported as keys, and keys inside
+    a loop (expected to repeat as list items) are skipped. Comments, other
+    Jinja2 tags/expressions and list items never match KEY_LINE_RE.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        text = f.read()
+
     keys = []
-    key_pattern = re.compile(r'^(\s*)(\w[\w.-]*)\s*:')
     loop_depth = 0
+    line_num = 1
+    counted_to = 0
+    count_newlines = text.count
+    tags = LOOP_TAG_RE.finditer(text)
+    tag = next(tags, None)
+    next_tag = tag.start() if tag else len(text)
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
-            stripped = line.strip()
-
-            # Track Jinja2 for-loop nesting
-            if '{%' in stripped:
-                if 'for ' in stripped:
-                    loop_depth += 1
-                    continue
-                if 'endfor' in stripped:
-                    loop_depth = max(0, loop_depth - 1)
-                    continue
-
-            # Skip comments, Jinja2 expressions, list items
-            if stripped.startswith('#') or stripped.startswith('{%'):
-                continue
-            if stripped.startswith('{{') and ':' not in stripped:
-                continue
-            if stripped.startswith('- '):
-                continue
-
-            match = key_pattern.match(line)
-            if match:
-                indent = len(match.group(1))
-                key_name = match.group(2)
-                keys.append({
-                    'key': key_name,
-                    'indent': indent,
-                    'line': line_num,
-                    'in_loop': loop_depth > 0,
-                    'raw': line.rstrip(),
-                })
+    for match in KEY_LINE_RE.finditer(text):
+        start, end = match.span()
+
+        # Apply loop tags that precede this line
+        while next_tag < start:
+            loop_depth = max(0, loop_depth - 1) if tag.group(1) else loop_depth + 1
+            tag = next(tags, None)
+            next_tag = tag.start() if tag else len(text)
+
+        if next_tag < end:
+            continue  # the line opens or closes a loop
+
+        # Keys inside for-loops are expected to repeat (list items)
+        if loop_depth:
+            continue
+
+        line_num += count_newlines('\n', counted_to, start)
+        counted_to = start
+        keys.append({
+            'key': match.group(2),
+            'indent': len(match.group(1)),
+            'line': line_num,
+            'raw': match.group().rstrip(),
+        })
 
     return keys
 
 
 def find_duplicates(keys):
-    """Find duplicate keys at the same indentation level outside loops."""
+    """Find duplicate keys at the same indentation level."""
     issues = []
     seen = {}  # (indent, key) -> first occurrence line
 
     for entry in keys:
         lookup = (entry['indent'], entry['key'])
-
-        # Keys inside for-loops are expected to repeat (list items)
-        if entry['in_loop']:
-            continue
-
         if lookup in seen:
             issues.append({
                 'key': entry['key'],
@@ -114,14 +142,24 @@ def find_duplicates(keys):
     return issues
 
 
+def check_template(filepath):
+    """Return the duplicate-key issues for one template."""
+    return find_duplicates(extract_keys(filepath))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Check for duplicate keys in audit templates')
     parser.add_argument('repo_path', help='Path to the repo root')
     parser.add_argument('--pattern', nargs='*', default=[],
                         help='Additional filename regex patterns to match')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Worker processes for checking templates (default: 1)')
     args = parser.parse_args()
 
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
     extra_patterns = [re.compile(p) for p in args.pattern]
     templates = find_audit_templates(args.repo_path, extra_patterns)
 
@@ -131,10 +169,14 @@ def main():
 
     total_issues = 0
 
-    for template in templates:
+    if args.jobs > 1 and len(templates) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(check_template, templates))
+    else:
+        results = [check_template(template) for template in templates]
+
+    for template, issues in zip(templates, results):
         rel_path = os.path.relpath(template, args.repo_path)
-        keys = extract_keys(template)
-        issues = find_duplicates(keys)
 
         if issues:
             print(f"\n{rel_path}:")
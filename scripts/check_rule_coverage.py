@@ -16,50 +16,60 @@ Usage:
 """
 
 import argparse
+import concurrent.futures
+import functools
+import hashlib
 import os
 import re
 import sys
 from collections import Counter
 
+# Toggle definitions in defaults/main.yml, tried per line in this order
+# (leading whitespace allowed; [^\S\n] keeps matches within one line):
+#   cis:   {prefix}_rule_\d...
+#   stig:  {prefix}_NN_NNNNNN:            (e.g. rhel_08_010000)
+#          {prefix ending in stig}_NNNNNN: (e.g. az2023stig_001010, any case)
+TOGGLE_DEFINITION_RE = re.compile(
+    r'^[^\S\n]*(?:'
+    r'(?P<cis>\w+)_rule_\d'
+    r'|(?P<stig>\w+_\d{2})_\d{6}[^\S\n]*:'
+    r'|(?P<stig_any_case>(?i:\w*stig))_(?i:\d{6})[^\S\n]*:'
+    r')',
+    re.MULTILINE)
+
+
+def read_defaults(repo_path):
+    """Return the text of defaults/main.yml, or None if it does not exist.
+
+    main() reads the file once and hands the text to both
+    detect_prefix_and_type and find_rule_definitions.
+    """
+    defaults_file = os.path.join(repo_path, 'defaults', 'main.yml')
+    if not os.path.isfile(defaults_file):
+        return None
+    with open(defaults_file, 'r', encoding='utf-8') as f:
+        return f.read()
+
 
-def detect_prefix_and_type(repo_path):
+def detect_prefix_and_type(repo_path, defaults_text=None):
     """Auto-detect the benchmark prefix and type from defaults/main.yml.
 
     Returns (prefix, benchmark_type) where:
     - CIS:  prefix like 'ubtu20cis', type='cis'
     - STIG: prefix like 'rhel_08', type='stig'
     """
-    defaults_file = os.path.join(repo_path, 'defaults', 'main.yml')
-    if not os.path.isfile(defaults_file):
-        return None, None
+    if defaults_text is None:
+        defaults_text = read_defaults(repo_path)
+        if defaults_text is None:
+            return None, None
 
-    # Try CIS pattern first: {prefix}_rule_\d
-    cis_pattern = re.compile(r'^(\w+)_rule_\d')
     cis_prefixes = Counter()
-
-    # Try STIG patterns: {prefix}_\d{6}: (bool)
-    # Pattern A: prefix with 2-digit numeric segment (e.g. rhel_08_010000)
-    stig_pattern_a = re.compile(r'^(\w+_\d{2})_(\d{6})\s*:')
-    # Pattern B: prefix ending in "stig" followed by _6digits (e.g. az2023stig_001010)
-    stig_pattern_b = re.compile(r'^(\w*stig)_(\d{6})\s*:', re.IGNORECASE)
     stig_prefixes = Counter()
-
-    with open(defaults_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            stripped = line.strip()
-            if not stripped or stripped.startswith('#'):
-                continue
-
-            m = cis_pattern.match(stripped)
-            if m:
-                cis_prefixes[m.group(1)] += 1
-                continue
-
-            m = stig_pattern_a.match(stripped)
-            if not m:
-                m = stig_pattern_b.match(stripped)
-            if m:
-                stig_prefixes[m.group(1)] += 1
+    for m in TOGGLE_DEFINITION_RE.finditer(defaults_text):
+        if m.group('cis'):
+            cis_prefixes[m.group('cis')] += 1
+        else:
+            stig_prefixes[m.group('stig') or m.group('stig_any_case')] += 1
 
     if cis_prefixes and (not stig_prefixes
                          or cis_prefixes.most_common(1)[0][1]
@@ -72,47 +82,132 @@ def detect_prefix_and_type(repo_path):
     return None, None
 
 
-def find_rule_definitions(repo_path, prefix, benchmark_type):
+def find_rule_definitions(repo_path, prefix, benchmark_type, defaults_text=None):
     """Find all rule toggle variables in defaults/main.yml."""
-    defaults_file = os.path.join(repo_path, 'defaults', 'main.yml')
+    if defaults_text is None:
+        defaults_file = os.path.join(repo_path, 'defaults', 'main.yml')
+        with open(defaults_file, 'r', encoding='utf-8') as f:
+            defaults_text = f.read()
     rules = {}
 
     if benchmark_type == 'stig':
         pattern = re.compile(
-            rf'^({re.escape(prefix)}_\d{{6}})\s*:', re.IGNORECASE)
+            rf'^[^\S\n]*({re.escape(prefix)}_\d{{6}})[^\S\n]*:', re.IGNORECASE | re.MULTILINE)
     else:
         pattern = re.compile(
-            rf'^({re.escape(prefix)}_rule_[\d_]+)\s*:', re.IGNORECASE)
+            rf'^[^\S\n]*({re.escape(prefix)}_rule_[\d_]+)[^\S\n]*:', re.IGNORECASE | re.MULTILINE)
 
-    with open(defaults_file, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
-            match = pattern.match(line.strip())
-            if match:
-                rules[match.group(1)] = line_num
+    # One scan over the whole file; line numbers come from counting the
+    # newlines between successive matches.
+    line_num = 1
+    counted_to = 0
+    for match in pattern.finditer(defaults_text):
+        line_num += defaults_text.count('\n', counted_to, match.start())
+        counted_to = match.start()
+        rules[match.group(1)] = line_num
 
     return rules
 
 
-def find_rule_usage(search_dir, rules, extensions):
-    """Find which rules are referenced in files under a directory."""
+def iter_files(top):
+    """Yield every non-directory DirEntry under top, as os.walk would (unsorted)."""
+    stack = [top]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        yield entry
+                    elif not entry.is_symlink():
+                        stack.append(entry.path)
+        except OSError:
+            continue
+
+
+def _rules_in_text(content, rule_set, anchor, lengths):
+    """Return the rules in rule_set that occur anywhere in content.
+
+    Every rule starts with ``anchor`` (the rules' common prefix), so only
+    positions where the anchor occurs are examined, testing one slice per
+    distinct rule length. This matches ``rule in content`` for each rule,
+    including rules that are prefixes of longer ones, in a single pass.
+    """
+    found = set()
+    pos = content.find(anchor)
+    while pos != -1:
+        for length in lengths:
+            candidate = content[pos:pos + length]
+            if candidate in rule_set:
+                found.add(candidate)
+        pos = content.find(anchor, pos + 1)
+    return found
+
+
+def _scan_file(filepath, rule_set, anchor, lengths, memo=None):
+    """Return the rules referenced in one file (empty if it cannot be read).
+
+    The file is searched as raw bytes, so rule_set, anchor and lengths
+    must be UTF-8 encoded; since UTF-8 is self-synchronising, a byte match
+    is exactly a match in the decoded text, and no file is decoded.
+
+    With a memo dict, results are cached under a BLAKE2 digest of the
+    file's bytes, so files with identical contents (common among generated
+    task files) are scanned only once. Hashing costs a fraction of a scan.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except (IOError, OSError):
+        return set()
+    if memo is not None:
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        found = memo.get(digest)
+        if found is not None:
+            return found
+    if anchor:
+        found = _rules_in_text(data, rule_set, anchor, lengths)
+    else:
+        found = {r for r in rule_set if r in data}
+    if memo is not None:
+        memo[digest] = found
+    return found
+
+
+def find_rule_usage(search_dir, rules, extensions, executor=None):
+    """Find which rules are referenced in files under a directory.
+
+    With an executor (e.g. a ProcessPoolExecutor), files are scanned in
+    its workers and the per-file results merged. The scan stops as soon as
+    every rule has been seen; sequentially, the rest of the tree is then
+    neither walked nor read.
+    """
     used_rules = set()
 
-    if not os.path.isdir(search_dir):
+    if not os.path.isdir(search_dir) or not rules:
         return used_rules
 
-    for root, _, files in os.walk(search_dir):
-        for fname in files:
-            if not any(fname.endswith(ext) for ext in extensions):
-                continue
-            filepath = os.path.join(root, fname)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                for rule_name in rules:
-                    if rule_name in content:
-                        used_rules.add(rule_name)
-            except (IOError, OSError):
-                continue
+    encoded = {rule_name.encode('utf-8'): rule_name for rule_name in rules}
+    scan = functools.partial(
+        _scan_file,
+        rule_set=set(encoded),
+        anchor=os.path.commonprefix(list(encoded)),
+        lengths=sorted({len(rule_name) for rule_name in encoded}),
+    )
+    suffixes = tuple(extensions)
+    paths = (entry.path for entry in iter_files(search_dir) if entry.name.endswith(suffixes))
+
+    if executor is None:
+        found_per_file = map(functools.partial(scan, memo={}), paths)
+    else:
+        found_per_file = executor.map(scan, paths, chunksize=16)
+    for found in found_per_file:
+        used_rules.update(encoded[rule_name] for rule_name in found)
+        if len(used_rules) == len(encoded):
+            break
 
     return used_rules
 
@@ -127,17 +222,23 @@ def main():
                              'Auto-detected if omitted.')
     parser.add_argument('--type', choices=['cis', 'stig'], default=None,
                         help='Benchmark type. Auto-detected if omitted.')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Worker processes for scanning files (default: 1)')
     args = parser.parse_args()
 
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
     if not os.path.isdir(args.repo_path):
         print(f"Error: {args.repo_path} is not a directory", file=sys.stderr)
         sys.exit(1)
 
     prefix = args.prefix
     bm_type = args.type
+    defaults_text = read_defaults(args.repo_path)
 
     if not prefix:
-        prefix, detected_type = detect_prefix_and_type(args.repo_path)
+        prefix, detected_type = detect_prefix_and_type(args.repo_path, defaults_text)
         if not bm_type:
             bm_type = detected_type
 
@@ -152,16 +253,23 @@ def main():
     print(f"Benchmark prefix: {prefix}")
     print(f"Benchmark type:   {bm_type}")
 
-    rules = find_rule_definitions(args.repo_path, prefix, bm_type)
+    rules = find_rule_definitions(args.repo_path, prefix, bm_type, defaults_text)
     print(f"Rules defined in defaults: {len(rules)}")
 
     tasks_dir = os.path.join(args.repo_path, 'tasks')
     templates_dir = os.path.join(args.repo_path, 'templates')
     handlers_dir = os.path.join(args.repo_path, 'handlers')
 
-    used_in_tasks = find_rule_usage(tasks_dir, rules, {'.yml', '.yaml'})
-    used_in_templates = find_rule_usage(templates_dir, rules, {'.j2', '.yml'})
-    used_in_handlers = find_rule_usage(handlers_dir, rules, {'.yml', '.yaml'})
+    executor = None
+    if args.jobs > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs)
+    try:
+        used_in_tasks = find_rule_usage(tasks_dir, rules, {'.yml', '.yaml'}, executor)
+        used_in_templates = find_rule_usage(templates_dir, rules, {'.j2', '.yml'}, executor)
+        used_in_handlers = find_rule_usage(handlers_dir, rules, {'.yml', '.yaml'}, executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     all_used = used_in_tasks | used_in_templates | used_in_handlers
     missing_from_tasks = set(rules.keys()) - used_in_tasks
@@ -42,6 +42,25 @@ def should_exclude(fname, excludes, exclude_patterns):
     return False
 
 
+def iter_files(top):
+    """Yield every non-directory DirEntry under top, as os.walk would (unsorted)."""
+    stack = [top]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        yield entry
+                    elif not entry.is_symlink():
+                        stack.append(entry.path)
+        except OSError:
+            continue
+
+
 def find_templates(repo_path, excludes, exclude_patterns):
     """Find all .j2 files under templates/."""
     templates_dir = os.path.join(repo_path, 'templates')
@@ -51,24 +70,43 @@ def find_templates(repo_path, excludes, exclude_patterns):
 
     found = []
     excluded = []
-    for root, _, filenames in os.walk(templates_dir):
-        for fname in filenames:
-            if not fname.endswith('.j2'):
-                continue
-            filepath = os.path.join(root, fname)
-            if should_exclude(fname, excludes, exclude_patterns):
-                excluded.append(os.path.relpath(filepath, repo_path))
-            else:
-                found.append(filepath)
+    for entry in iter_files(templates_dir):
+        if not entry.name.endswith('.j2'):
+            continue
+        if should_exclude(entry.name, excludes, exclude_patterns):
+            excluded.append(os.path.relpath(entry.path, repo_path))
+        else:
+            found.append(entry.path)
     return sorted(found), sorted(excluded)
 
 
+# Bytes read from the start of each template to find its first line
+HEADER_PROBE_SIZE = 4096
+
+
+def _first_line_bytes(filepath):
+    """Return the raw first line of a file (without its line break).
+
+    Reads only HEADER_PROBE_SIZE bytes through a bare file descriptor,
+    avoiding the buffered text-layer setup of open(); falls back to a full
+    readline for a longer first line. Like text-mode readline, '\n', '\r'
+    and '\r\n' all end the line.
+    """
+    fd = os.open(filepath, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        head = os.read(fd, HEADER_PROBE_SIZE)
+    finally:
+        os.close(fd)
+    if len(head) == HEADER_PROBE_SIZE and b'\n' not in head and b'\r' not in head:
+        with open(filepath, 'rb') as f:
+            head = f.readline()
+    return head.split(b'\n', 1)[0].split(b'\r', 1)[0]
+
+
 def check_header(filepath):
     """Check if file has the managed-by-ansible header on line 1."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            first_line = f.readline()
-        return 'file_managed_by_ansible' in first_line
+        return b'file_managed_by_ansible' in _first_line_bytes(filepath)
     except (IOError, OSError):
         return False
 
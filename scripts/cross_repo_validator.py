@@ -22,14 +22,17 @@ Supports both STIG and CIS benchmark types, and works with public repos
  13. Goss Block Pairing            - if/range/end blocks are balanced in audit files
  14. When-Toggle Alignment         - task when: conditions reference correct toggle (STIG)
 
-Zero external dependencies — uses Python 3 standard library only.
+Standard library only; orjson is used if installed.
 """
 
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import contextlib
 import datetime
 import fnmatch
+import functools
 import json
 import os
 import re
@@ -38,7 +41,12 @@ import sys
 import time
 from collections import Counter, defaultdict
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Set, Tuple, TypedDict
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, TypedDict
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:
+    orjson = None
 
 
 # ---------------------------------------------------------------------------
@@ -50,6 +58,49 @@ VERSION = "2.7.0"
 BENCHMARK_STIG = "stig"
 BENCHMARK_CIS = "cis"
 
+# Well-known runtime variables injected by the audit script/goss runner
+# (not expected to be in vars file)
+RUNTIME_VARS = frozenset({
+    "machine_uuid", "epoch", "os_locale", "os_release",
+    "os_distribution", "auto_group", "os_hostname", "system_type",
+    "benchmark_type", "benchmark_version", "benchmark_os",
+    "system_is_container",
+})
+
+# YAML block scalar indicators; values like these span several lines and
+# are not compared
+YAML_BLOCK_INDICATORS = frozenset({"|", ">", "|-", ">-"})
+
+# Bump when the per-file results stored by --cache change shape
+SCAN_CACHE_FORMAT = 2
+
+# Fixed patterns, compiled once and shared by every file and line scanned.
+# Patterns that depend on the benchmark prefix are built by the
+# build_*_pattern helpers below.
+TOP_LEVEL_VAR_RE = re.compile(r"^([a-zA-Z_]\w*):")
+VAR_DEFINITION_RE = re.compile(r"^(\w+)\s*:")
+TOGGLE_VALUE_RE = re.compile(r"[^\S\n]*(\S+)")
+STIG_AUDIT_FILENAME_RE = re.compile(r"^([A-Z]+-\d+)-\d{6}\.yml$")
+STIG_ID_RE = re.compile(r"^[A-Z]+-\d+-\d{6}$")
+RULE_NUMBER_SUFFIX_RE = re.compile(r"(\d{6})$")
+# Patterns below never span a line break, so they can be run over a whole
+# file's text
+AUDIT_RULE_ID_RE = re.compile(r"Rule_ID:[^\S\n]*(SV-\d+r\d+_rule)")
+AUDIT_STIG_ID_RE = re.compile(r"STIG_ID:[^\S\n]*(\S+)")
+AUDIT_CAT_RE = re.compile(r"Cat:[^\S\n]*(\d+)")
+AUDIT_DIR_CAT_RE = re.compile(r"(?:cat|section)_(\d+)")
+TASK_RULE_ID_RE = re.compile(r"(SV-\d+r\d+_rule)")
+TASK_NAME_KEY_RE = re.compile(r"name:")
+BENCHMARK_VERSION_RE = re.compile(r"^benchmark_version:\s*['\"]?([^'\"#\n]+)")
+RUN_AUDIT_VERSION_RE = re.compile(r"^BENCHMARK_VER\s*=\s*([^\s#]+)")
+STIG_VERSION_RE = re.compile(r"^(\d+)[rR](\d+)$")
+GOSS_GLOB_RE = re.compile(r"^([\w.*?/\[\]-]+\.yml)\s*:\s*\{\}")
+GOSS_VAR_REF_RE = re.compile(r"\.Vars\.(\w+)")
+# Opening ({{ if/range }}) and closing ({{ end }}) template blocks in one
+# pattern; group 1 is empty for a closing block
+GOSS_BLOCK_RE = re.compile(r"\{\{-?[^\S\n]*(?:(if|range)\s|end[^\S\n]*-?\}\})")
+TASK_SEVERITY_RE = re.compile(r"^\s*-?\s*name:\s*\"?(HIGH|MEDIUM|LOW)\s*\|", re.IGNORECASE)
+
 
 # ---------------------------------------------------------------------------
 # Data models (compatible with QA tool patterns)
@@ -57,6 +108,8 @@ BENCHMARK_CIS = "cis"
 
 @dataclass
 class Finding:
+    # Slotted: one instance per finding, and the report loops read every field
+    __slots__ = ("file", "line", "description", "severity", "check_name")
     file: str
     line: int
     description: str
@@ -111,7 +164,17 @@ def _get_git_branch(repo_dir: str) -> str:
     """Get the current git branch for a repository directory.
 
     Returns the branch name or '' if not a git repo / git unavailable.
+    A plain checkout's .git/HEAD is read directly; worktrees, detached
+    HEADs and subdirectories of a repo fall back to git rev-parse.
     """
+    try:
+        with open(os.path.join(repo_dir, ".git", "HEAD"), "r",
+                  encoding="utf-8") as fh:
+            head = fh.read().strip()
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/"):]
+    except (OSError, UnicodeDecodeError):
+        pass
     try:
         result = subprocess.run(
             ["git", "-C", repo_dir, "rev-parse", "--abbrev-ref", "HEAD"],
@@ -137,7 +200,7 @@ def auto_detect_prefix(defaults_path: str) -> str:
                 s = line.rstrip()
                 if not s or s.startswith("#") or s[0] in (" ", "\t"):
                     continue
-                m = re.match(r"^([a-zA-Z_]\w*):", s)
+                m = TOP_LEVEL_VAR_RE.match(s)
                 if m:
                     parts = m.group(1).split("_")
                     for i in range(1, min(4, len(parts))):
@@ -181,35 +244,57 @@ def build_toggle_pattern(prefix: str, benchmark_type: str) -> re.Pattern:
     return re.compile(rf"^({re.escape(prefix)}_\d{{6}})\s*:")
 
 
+def build_toggle_definition_pattern(prefix: str, benchmark_type: str) -> re.Pattern:
+    """Build the whole-file counterpart of build_toggle_pattern.
+
+    Matches an (optionally indented) toggle definition at the start of any
+    line, for use with finditer() over a file's full text.
+    """
+    if benchmark_type == BENCHMARK_CIS:
+        name = rf"{re.escape(prefix)}_rule_[\d_]+"
+    else:
+        name = rf"{re.escape(prefix)}_\d{{6}}"
+    return re.compile(rf"^[^\S\n]*({name})[^\S\n]*:", re.MULTILINE)
+
+
 def build_conditional_pattern(prefix: str, benchmark_type: str) -> re.Pattern:
     """Build the compiled regex for matching audit file conditionals.
 
-    Matches: {{ if .Vars.{toggle} }}
+    Matches: {{ if .Vars.{toggle} }} (within one line)
     """
     if benchmark_type == BENCHMARK_CIS:
         return re.compile(
-            rf"\{{\{{\s*if\s+\.Vars\.({re.escape(prefix)}_rule_[\d_]+)"
+            rf"\{{\{{[^\S\n]*if[^\S\n]+\.Vars\.({re.escape(prefix)}_rule_[\d_]+)"
         )
     return re.compile(
-        rf"\{{\{{\s*if\s+\.Vars\.({re.escape(prefix)}_\d{{6}})"
+        rf"\{{\{{[^\S\n]*if[^\S\n]+\.Vars\.({re.escape(prefix)}_\d{{6}})"
     )
 
 
+@functools.lru_cache(maxsize=None)
+def build_toggle_name_pattern(prefix: str, benchmark_type: str) -> re.Pattern:
+    """Build (once per prefix/type) the regex for a bare toggle variable name.
+
+    STIG: matches the whole name and captures the six-digit rule number.
+    CIS:  matches the '{prefix}_rule_{digit}' start of the name.
+    """
+    if benchmark_type == BENCHMARK_CIS:
+        return re.compile(rf"^{re.escape(prefix)}_rule_\d")
+    return re.compile(rf"^{re.escape(prefix)}_(\d{{6}})$")
+
+
 def auto_detect_rule_id_prefix(audit_dir: str) -> str:
     """Auto-detect the rule ID prefix from audit file names.
 
     For STIG repos: extracts e.g. 'AZLX-23' from 'AZLX-23-000100.yml'
     For CIS repos: returns '' (CIS uses section-based naming)
     """
-    for subdir in _find_audit_subdirs(audit_dir):
-        for _root, _dirs, files in os.walk(subdir):
-            for fname in sorted(files):
-                if not fname.endswith(".yml"):
-                    continue
-                # STIG pattern: AZLX-23-000100.yml
-                m = re.match(r"^([A-Z]+-\d+)-\d{6}\.yml$", fname)
-                if m:
-                    return m.group(1)
+    for fpath in _audit_yml_files(audit_dir):
+        fname = os.path.basename(fpath)
+        # STIG pattern: AZLX-23-000100.yml
+        m = STIG_AUDIT_FILENAME_RE.match(fname)
+        if m:
+            return m.group(1)
     return ""
 
 
@@ -242,10 +327,13 @@ def discover_audit_repo(remediation_dir: str) -> Optional[str]:
     # 3. Fuzzy: find any *-Audit sibling containing the benchmark root word
     root_word = benchmark.split("-")[0]
     try:
-        for entry in sorted(os.listdir(parent)):
-            full = os.path.join(parent, entry)
-            if os.path.isdir(full) and entry.endswith("-Audit") and root_word in entry:
-                return full
+        with os.scandir(parent) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries:
+            # Name test first: only the few *-Audit candidates need a stat
+            if (entry.name.endswith("-Audit") and root_word in entry.name
+                    and entry.is_dir()):
+                return entry.path
     except OSError:
         pass
 
@@ -280,25 +368,28 @@ def discover_audit_vars_file(audit_dir: str) -> str:
 # Extraction functions
 # ---------------------------------------------------------------------------
 
-def extract_rule_toggles(filepath: str, toggle_pat: re.Pattern) -> Dict[str, int]:
-    """Extract rule toggle variables matching the toggle pattern from a file.
+def extract_rule_toggles(filepath: str, toggle_def_pat: re.Pattern) -> Dict[str, int]:
+    """Extract rule toggle variables from a file.
 
+    toggle_def_pat comes from build_toggle_definition_pattern; the file is
+    scanned whole and line numbers are counted only up to each match.
     Returns {variable_name: line_number}.
     """
     toggles: Dict[str, int] = {}
     try:
-        with open(filepath, "r", encoding="utf-8") as fh:
-            for lineno, line in enumerate(fh, 1):
-                m = toggle_pat.match(line.strip())
-                if m:
-                    toggles[m.group(1)] = lineno
+        text = _read_text(filepath)
     except FileNotFoundError:
-        pass
+        return toggles
+    lineno, counted_to = 1, 0
+    for m in toggle_def_pat.finditer(text):
+        lineno += text.count("\n", counted_to, m.start())
+        counted_to = m.start()
+        toggles[m.group(1)] = lineno
     return toggles
 
 
 def extract_toggle_values(filepath: str,
-                          toggle_pat: re.Pattern) -> Dict[str, Tuple[str, int]]:
+                          toggle_def_pat: re.Pattern) -> Dict[str, Tuple[str, int]]:
     """Extract rule toggle variables with their boolean values.
 
     Returns {variable_name: (value_string, line_number)}.
@@ -306,187 +397,256 @@ def extract_toggle_values(filepath: str,
     """
     toggles: Dict[str, Tuple[str, int]] = {}
     try:
-        with open(filepath, "r", encoding="utf-8") as fh:
-            for lineno, line in enumerate(fh, 1):
-                stripped = line.strip()
-                m = toggle_pat.match(stripped)
-                if m:
-                    var_name = m.group(1)
-                    # Extract the value after the variable name and ':'
-                    val_match = re.match(
-                        rf"^{re.escape(var_name)}\s*:\s*(\S+)", stripped
-                    )
-                    val = val_match.group(1) if val_match else ""
-                    toggles[var_name] = (val, lineno)
+        text = _read_text(filepath)
     except FileNotFoundError:
-        pass
+        return toggles
+    lineno, counted_to = 1, 0
+    for m in toggle_def_pat.finditer(text):
+        lineno += text.count("\n", counted_to, m.start())
+        counted_to = m.start()
+        # Extract the value after the variable name and ':'
+        val_match = TOGGLE_VALUE_RE.match(text, m.end())
+        val = val_match.group(1) if val_match else ""
+        toggles[m.group(1)] = (val, lineno)
     return toggles
 
 
-def extract_audit_conditionals(audit_dir: str,
-                               cond_pat: re.Pattern) -> Dict[str, str]:
-    """Extract rule toggle references from audit file conditionals.
+def scan_audit_tree(
+    audit_dir: str, benchmark_type: str, cond_pat: re.Pattern, jobs: int = 1,
+    cache_path: Optional[str] = None,
+) -> Tuple[Dict[str, str], Dict[str, AuditInfo], Dict[str, Set[str]],
+           Dict[str, Tuple[int, int]]]:
+    """Extract conditionals, audit file metadata, .Vars references and blocks.
+
+    Walks all .yml files under cat_*/ directories (and section_*/ for CIS),
+    reading each file once for all four results:
+
+      conditionals   {variable_name: relative_filepath}
+      audit_files    {rule_key: AuditInfo} (goss.yml/main.yml excluded)
+      goss_var_refs  {variable_name: {set_of_relative_filepaths}}
+      block_counts   {relative_filepath: (opening, closing)} template
+                     blocks, in walk order (goss.yml/main.yml excluded)
 
-    Walks all .yml files under cat_*/ directories (and section_*/ for CIS).
-    Returns {variable_name: relative_filepath}.
+    With jobs > 1, files are read and scanned on a thread pool (which helps
+    most on network filesystems and cold caches); results are merged in
+    walk order, so the output does not depend on jobs.
+
+    With cache_path, per-file results are stored there as JSON and reused
+    on later runs for files whose (st_mtime_ns, st_size) are unchanged.
+    The cache is discarded if the tool version, audit directory, benchmark
+    type or conditional pattern differ; an unreadable cache is ignored.
     """
     conditionals: Dict[str, str] = {}
-    audit_dirs = _find_audit_subdirs(audit_dir)
+    audit_map: Dict[str, AuditInfo] = {}
+    references: Dict[str, Set[str]] = defaultdict(set)
+    block_counts: Dict[str, Tuple[int, int]] = {}
+
+    paths = _audit_yml_files(audit_dir)
+    scanned: Dict[str, Optional[Sequence]] = {}
+    misses: List[str] = []
+    if cache_path:
+        header = [VERSION, SCAN_CACHE_FORMAT, os.path.abspath(audit_dir),
+                  benchmark_type, cond_pat.pattern]
+        cached_files = _load_scan_cache(cache_path, header)
+        stamps: Dict[str, List[int]] = {}
+        new_cache: Dict[str, list] = {}
+        for fpath in paths:
+            try:
+                st = os.stat(fpath)
+            except OSError:
+                misses.append(fpath)
+                continue
+            stamp = [st.st_mtime_ns, st.st_size]
+            entry = cached_files.get(fpath)
+            if entry and entry[:2] == stamp:
+                scanned[fpath] = entry[2]
+                new_cache[fpath] = entry
+            else:
+                stamps[fpath] = stamp
+                misses.append(fpath)
+    else:
+        misses = list(paths)
 
-    for subdir in audit_dirs:
-        for root, _dirs, files in os.walk(subdir):
-            for fname in sorted(files):
-                if not fname.endswith(".yml"):
-                    continue
-                fpath = os.path.join(root, fname)
-                rel = os.path.relpath(fpath, audit_dir)
-                try:
-                    with open(fpath, "r", encoding="utf-8") as fh:
-                        for line in fh:
-                            m = cond_pat.search(line)
-                            if m:
-                                conditionals[m.group(1)] = rel
-                except (IOError, OSError):
-                    pass
-    return conditionals
+    scan = functools.partial(_scan_audit_file, audit_dir=audit_dir,
+                             benchmark_type=benchmark_type, cond_pat=cond_pat)
+    if jobs > 1 and len(misses) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+            scanned.update(zip(misses, pool.map(scan, misses)))
+    else:
+        scanned.update(zip(misses, map(scan, misses)))
+
+    if cache_path:
+        for fpath, stamp in stamps.items():
+            if scanned[fpath] is not None:
+                new_cache[fpath] = stamp + [scanned[fpath]]
+        if stamps or len(new_cache) != len(cached_files):
+            _save_scan_cache(cache_path, header, new_cache)
+
+    for fpath in paths:
+        result = scanned[fpath]
+        if result is None:
+            continue
+        rel, all_toggles, var_refs, entries, blocks = result
+        for toggle in all_toggles:
+            conditionals[toggle] = rel
+        for var in var_refs:
+            references[var].add(rel)
+        audit_map.update(entries)
+        if blocks is not None:
+            opens, closes = blocks
+            block_counts[rel] = (opens, closes)
 
+    return conditionals, audit_map, dict(references), block_counts
 
-def extract_audit_files(audit_dir: str, benchmark_type: str,
-                        prefix: str) -> Dict[str, AuditInfo]:
-    """Map rule identifiers to their audit file info.
 
-    For STIG: keys are STIG_IDs (e.g. 'AZLX-23-000100')
-    For CIS: keys are toggle names (e.g. 'rhel9cis_rule_1_1_1_1')
+def _load_scan_cache(cache_path: str, header: list) -> Dict[str, list]:
+    """Return the per-file entries of a --cache file written with header.
 
-    Returns {rule_key: {"file": relpath, "cat": int|None,
-                         "rule_id": str|None, "meta_id": str|None}}.
+    Returns {} if the file is missing, unreadable, or was written by a
+    different version or for different scan settings.
     """
-    rule_id_pat = re.compile(r"Rule_ID:\s*(SV-\d+r\d+_rule)")
-    stig_id_pat = re.compile(r"STIG_ID:\s*(\S+)")
-    cat_pat = re.compile(r"Cat:\s*(\d+)")
+    try:
+        with open(cache_path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data["header"] == header:
+            return data["files"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return {}
 
-    if benchmark_type == BENCHMARK_CIS:
-        cond_pat = re.compile(
-            rf"\{{\{{\s*if\s+\.Vars\.({re.escape(prefix)}_rule_[\d_]+)"
-        )
-    else:
-        cond_pat = re.compile(
-            rf"\{{\{{\s*if\s+\.Vars\.({re.escape(prefix)}_\d{{6}})"
-        )
 
-    audit_map: Dict[str, AuditInfo] = {}
-    audit_dirs = _find_audit_subdirs(audit_dir)
+def _save_scan_cache(cache_path: str, header: list, files: Dict[str, list]) -> None:
+    """Atomically write a --cache file; failures are ignored."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        # json.dumps uses the C encoder; json.dump(obj, fh) does not
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps({"header": header, "files": files}))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
 
-    for subdir in audit_dirs:
-        for root, _dirs, files in os.walk(subdir):
-            for fname in sorted(files):
-                if not fname.endswith(".yml") or fname in ("goss.yml", "main.yml"):
-                    continue
 
-                fpath = os.path.join(root, fname)
-                rel = os.path.relpath(fpath, audit_dir)
-                stem = os.path.splitext(fname)[0]
-
-                # Determine cat/section from directory path
-                dir_cat = None
-                cat_match = re.search(r"(?:cat|section)_(\d+)", rel)
-                if cat_match:
-                    dir_cat = int(cat_match.group(1))
-
-                meta_cat = None
-                all_toggles: List[str] = []
-                all_stig_ids: List[str] = []
-                all_rule_ids: List[str] = []
-
-                try:
-                    with open(fpath, "r", encoding="utf-8") as fh:
-                        for line in fh:
-                            m = rule_id_pat.search(line)
-                            if m:
-                                rid = m.group(1)
-                                if rid not in all_rule_ids:
-                                    all_rule_ids.append(rid)
-                            m = stig_id_pat.search(line)
-                            if m:
-                                sid = m.group(1)
-                                if sid not in all_stig_ids:
-                                    all_stig_ids.append(sid)
-                            if meta_cat is None:
-                                m = cat_pat.search(line)
-                                if m:
-                                    meta_cat = int(m.group(1))
-                            # Collect ALL toggle conditionals (files
-                            # may contain multiple rules in one file)
-                            m = cond_pat.search(line)
-                            if m:
-                                toggle = m.group(1)
-                                if toggle not in all_toggles:
-                                    all_toggles.append(toggle)
-                except (IOError, OSError):
-                    continue
+def _scan_audit_file(
+    fpath: str, audit_dir: str, benchmark_type: str, cond_pat: re.Pattern,
+) -> Optional[Tuple[str, List[str], List[str], Dict[str, AuditInfo],
+                    Optional[Tuple[int, int]]]]:
+    """Read and scan one audit file for scan_audit_tree.
 
-                toggle_from_conditional = all_toggles[0] if all_toggles else None
-
-                # Determine the key(s) for this audit file
-                if benchmark_type == BENCHMARK_STIG:
-                    if re.match(r"^[A-Z]+-\d+-\d{6}$", stem):
-                        # Standard single-rule file — register by filename
-                        audit_map[stem] = {
-                            "file": rel,
-                            "cat": dir_cat,
-                            "meta_cat": meta_cat,
-                            "rule_id": all_rule_ids[0] if all_rule_ids else None,
-                            "meta_id": all_stig_ids[0] if all_stig_ids else None,
-                            "toggle": toggle_from_conditional,
-                        }
-                    elif all_stig_ids:
-                        # Non-standard name with metadata — register each
-                        # STIG_ID found (handles multi-rule files)
-                        for i, sid in enumerate(all_stig_ids):
-                            rid = all_rule_ids[i] if i < len(all_rule_ids) else None
-                            tog = all_toggles[i] if i < len(all_toggles) else None
-                            audit_map[sid] = {
-                                "file": rel,
-                                "cat": dir_cat,
-                                "meta_cat": meta_cat,
-                                "rule_id": rid,
-                                "meta_id": sid,
-                                "toggle": tog,
-                            }
-                    elif stem:
-                        # Fallback to filename stem
-                        audit_map[stem] = {
-                            "file": rel,
-                            "cat": dir_cat,
-                            "meta_cat": meta_cat,
-                            "rule_id": all_rule_ids[0] if all_rule_ids else None,
-                            "meta_id": None,
-                            "toggle": toggle_from_conditional,
-                        }
-                else:
-                    # CIS: register an entry for EACH toggle in the file
-                    if all_toggles:
-                        for toggle in all_toggles:
-                            audit_map[toggle] = {
-                                "file": rel,
-                                "cat": dir_cat,
-                                "meta_cat": meta_cat,
-                                "rule_id": all_rule_ids[0] if all_rule_ids else None,
-                                "meta_id": all_stig_ids[0] if all_stig_ids else None,
-                                "toggle": toggle,
-                            }
-                    else:
-                        # No conditional found; fall back to filename stem
-                        audit_map[stem] = {
-                            "file": rel,
-                            "cat": dir_cat,
-                            "meta_cat": meta_cat,
-                            "rule_id": all_rule_ids[0] if all_rule_ids else None,
-                            "meta_id": None,
-                            "toggle": None,
-                        }
+    Returns (relpath, toggles, .Vars references, audit_map entries,
+    (opening, closing) block counts or None for goss.yml/main.yml), or
+    None if the file cannot be read.
+    """
+    rel = _relpath_under(fpath, audit_dir)
+    try:
+        text = _read_text(fpath)
+    except (IOError, OSError):
+        return None
+
+    # Collect ALL toggle conditionals (files
+    # may contain multiple rules in one file)
+    all_toggles = _first_match_per_line(cond_pat, text)
+    entries: Dict[str, AuditInfo] = {}
+    blocks = None
+    if os.path.basename(fpath) not in ("goss.yml", "main.yml"):
+        _register_audit_file(entries, rel, text, all_toggles, benchmark_type)
+        # Template block counts for the goss block pairing check
+        found = GOSS_BLOCK_RE.findall(text)
+        closes = found.count("")
+        blocks = (len(found) - closes, closes)
+    return rel, all_toggles, GOSS_VAR_REF_RE.findall(text), entries, blocks
+
+
+def _register_audit_file(audit_map: Dict[str, AuditInfo], rel: str, text: str,
+                         all_toggles: List[str], benchmark_type: str) -> None:
+    """Add the audit_map entries for one audit file.
+
+    For STIG: keys are STIG_IDs (e.g. 'AZLX-23-000100')
+    For CIS: keys are toggle names (e.g. 'rhel9cis_rule_1_1_1_1')
 
-    return audit_map
+    Each entry is {"file": relpath, "cat": int|None, "meta_cat": int|None,
+    "rule_id": str|None, "meta_id": str|None, "toggle": str|None}.
+    """
+    stem = os.path.splitext(os.path.basename(rel))[0]
+
+    # Determine cat/section from directory path
+    dir_cat = None
+    cat_match = AUDIT_DIR_CAT_RE.search(rel)
+    if cat_match:
+        dir_cat = int(cat_match.group(1))
+
+    # Most files need only the first Rule_ID/STIG_ID, so stop at the
+    # first match; multi-rule STIG files collect the rest below
+    m = AUDIT_RULE_ID_RE.search(text)
+    first_rule_id = m.group(1) if m else None
+    m = AUDIT_STIG_ID_RE.search(text)
+    first_stig_id = m.group(1) if m else None
+    m = AUDIT_CAT_RE.search(text)
+    meta_cat = int(m.group(1)) if m else None
+
+    toggle_from_conditional = all_toggles[0] if all_toggles else None
+
+    # Determine the key(s) for this audit file
+    if benchmark_type == BENCHMARK_STIG:
+        if STIG_ID_RE.match(stem):
+            # Standard single-rule file — register by filename
+            audit_map[stem] = {
+                "file": rel,
+                "cat": dir_cat,
+                "meta_cat": meta_cat,
+                "rule_id": first_rule_id,
+                "meta_id": first_stig_id,
+                "toggle": toggle_from_conditional,
+            }
+        elif first_stig_id:
+            # Non-standard name with metadata — register each
+            # STIG_ID found (handles multi-rule files)
+            all_rule_ids = _first_match_per_line(AUDIT_RULE_ID_RE, text)
+            all_stig_ids = _first_match_per_line(AUDIT_STIG_ID_RE, text)
+            for i, sid in enumerate(all_stig_ids):
+                rid = all_rule_ids[i] if i < len(all_rule_ids) else None
+                tog = all_toggles[i] if i < len(all_toggles) else None
+                audit_map[sid] = {
+                    "file": rel,
+                    "cat": dir_cat,
+                    "meta_cat": meta_cat,
+                    "rule_id": rid,
+                    "meta_id": sid,
+                    "toggle": tog,
+                }
+        elif stem:
+            # Fallback to filename stem
+            audit_map[stem] = {
+                "file": rel,
+                "cat": dir_cat,
+                "meta_cat": meta_cat,
+                "rule_id": first_rule_id,
+                "meta_id": None,
+                "toggle": toggle_from_conditional,
+            }
+    else:
+        # CIS: register an entry for EACH toggle in the file
+        if all_toggles:
+            for toggle in all_toggles:
+                audit_map[toggle] = {
+                    "file": rel,
+                    "cat": dir_cat,
+                    "meta_cat": meta_cat,
+                    "rule_id": first_rule_id,
+                    "meta_id": first_stig_id,
+                    "toggle": toggle,
+                }
+        else:
+            # No conditional found; fall back to filename stem
+            audit_map[stem] = {
+                "file": rel,
+                "cat": dir_cat,
+                "meta_cat": meta_cat,
+                "rule_id": first_rule_id,
+                "meta_id": None,
+                "toggle": None,
+            }
 
 
 def extract_task_data(tasks_dir: str, benchmark_type: str,
@@ -499,7 +659,7 @@ def extract_task_data(tasks_dir: str, benchmark_type: str,
 
     Returns {rule_key: {"rule_id": str|None, "cat": int, "file": relpath}}.
     """
-    rule_id_pat = re.compile(r"(SV-\d+r\d+_rule)")
+    rule_id_pat = TASK_RULE_ID_RE
     task_map: Dict[str, TaskInfo] = {}
 
     if benchmark_type == BENCHMARK_STIG and rule_id_prefix:
@@ -518,6 +678,14 @@ def extract_task_data(tasks_dir: str, benchmark_type: str,
     else:
         when_pat = None
 
+    # Only name lines, toggle lines and Rule_ID lines can change task_map;
+    # other lines are skipped without a Python-level visit
+    relevant_pats = [rule_id_pat]
+    if name_pat:
+        relevant_pats.append(TASK_NAME_KEY_RE)
+    elif when_pat:
+        relevant_pats.append(when_pat)
+
     # Discover task subdirectories dynamically (cat_* for STIG, section_* for CIS)
     task_subdirs: List[str] = []
     if os.path.isdir(tasks_dir):
@@ -527,6 +695,7 @@ def extract_task_data(tasks_dir: str, benchmark_type: str,
                                          entry.startswith("section_")):
                 task_subdirs.append(entry)
 
+    tasks_parent = os.path.dirname(tasks_dir)
     for subdir_name in task_subdirs:
         cat_path = os.path.join(tasks_dir, subdir_name)
         # Extract numeric portion: cat_1 -> 1, section_3 -> 3
@@ -536,16 +705,15 @@ def extract_task_data(tasks_dir: str, benchmark_type: str,
             if not fname.endswith(".yml") or fname == "main.yml":
                 continue
             fpath = os.path.join(cat_path, fname)
-            rel = os.path.relpath(fpath, os.path.dirname(tasks_dir))
+            rel = _relpath_under(fpath, tasks_parent)
 
             try:
-                with open(fpath, "r", encoding="utf-8") as fh:
-                    lines = fh.readlines()
+                text = _read_text(fpath)
             except (IOError, OSError):
                 continue
 
             current_key = None
-            for line in lines:
+            for line in _lines_matching(relevant_pats, text):
                 stripped = line.strip()
 
                 if benchmark_type == BENCHMARK_STIG and name_pat:
@@ -606,7 +774,7 @@ def extract_versions(defaults_path: str, audit_vars_path: str,
     try:
         with open(defaults_path, "r", encoding="utf-8") as fh:
             for line in fh:
-                m = re.match(r"^benchmark_version:\s*['\"]?([^'\"#\n]+)", line)
+                m = BENCHMARK_VERSION_RE.match(line)
                 if m:
                     versions["defaults/main.yml"] = m.group(1).strip()
                     break
@@ -619,7 +787,7 @@ def extract_versions(defaults_path: str, audit_vars_path: str,
     try:
         with open(audit_vars_path, "r", encoding="utf-8") as fh:
             for line in fh:
-                m = re.match(r"^benchmark_version:\s*['\"]?([^'\"#\n]+)", line)
+                m = BENCHMARK_VERSION_RE.match(line)
                 if m:
                     versions[audit_vars_name] = m.group(1).strip()
                     break
@@ -630,7 +798,7 @@ def extract_versions(defaults_path: str, audit_vars_path: str,
     try:
         with open(run_audit_path, "r", encoding="utf-8") as fh:
             for line in fh:
-                m = re.match(r"^BENCHMARK_VER\s*=\s*([^\s#]+)", line)
+                m = RUN_AUDIT_VERSION_RE.match(line)
                 if m:
                     versions["run_audit.sh"] = m.group(1).strip()
                     break
@@ -648,7 +816,7 @@ def normalize_version(raw: str) -> Tuple[int, ...]:
     raw = raw.strip().lstrip("vV")
 
     # Try v{major}r{minor} format (STIG convention)
-    m = re.match(r"^(\d+)[rR](\d+)$", raw)
+    m = STIG_VERSION_RE.match(raw)
     if m:
         return (int(m.group(1)), int(m.group(2)))
 
@@ -674,7 +842,7 @@ def parse_goss_globs(goss_path: str) -> List[str]:
                     continue
                 if "{{" in stripped:
                     continue
-                m = re.match(r"^([\w.*?/\[\]-]+\.yml)\s*:\s*\{\}", stripped)
+                m = GOSS_GLOB_RE.match(stripped)
                 if m:
                     patterns.append(m.group(1))
     except FileNotFoundError:
@@ -705,15 +873,14 @@ def _is_toggle_var(var: str, prefix: str, benchmark_type: str) -> bool:
     STIG: {prefix}_{6digits}  e.g. az2023stig_000100
     CIS:  {prefix}_rule_{sections}  e.g. rhel9cis_rule_1_1_1_1
     """
-    if benchmark_type == BENCHMARK_CIS:
-        return bool(re.match(rf"^{re.escape(prefix)}_rule_\d", var))
-    return bool(re.match(rf"^{re.escape(prefix)}_\d{{6}}$", var))
+    return bool(build_toggle_name_pattern(prefix, benchmark_type).match(var))
 
 
 def _strip_yaml_value(raw: str) -> str:
     """Strip inline comments and surrounding quotes from a raw YAML value."""
-    if "  #" in raw:
-        raw = raw[:raw.index("  #")].strip()
+    comment = raw.find("  #")
+    if comment != -1:
+        raw = raw[:comment].strip()
     if len(raw) >= 2 and raw[0] in ("'", '"') and raw[-1] == raw[0]:
         raw = raw[1:-1]
     return raw
@@ -724,14 +891,121 @@ def _find_audit_subdirs(audit_dir: str) -> List[str]:
     subdirs: List[str] = []
     if not os.path.isdir(audit_dir):
         return subdirs
-    for entry in sorted(os.listdir(audit_dir)):
-        full = os.path.join(audit_dir, entry)
-        if os.path.isdir(full) and (entry.startswith("cat_") or
-                                     entry.startswith("section_")):
-            subdirs.append(full)
+    with os.scandir(audit_dir) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if (entry.name.startswith("cat_") or
+                entry.name.startswith("section_")) and entry.is_dir():
+            subdirs.append(entry.path)
     return subdirs
 
 
+def _relpath_under(path: str, top: str) -> str:
+    """os.path.relpath(path, top) for a path built by joining onto top.
+
+    Such paths start with top plus a separator, so slicing gives the same
+    result without relpath's normalisation of both arguments.
+    """
+    prefix = top if top.endswith(os.sep) else top + os.sep
+    if path.startswith(prefix):
+        return path[len(prefix):]
+    return os.path.relpath(path, top)
+
+
+def _read_text(path: str) -> str:
+    """Read a whole UTF-8 file as text with universal newlines.
+
+    Reads bytes and decodes once, which skips the TextIOWrapper set-up
+    that dominates open(..., "r") for small files.
+    """
+    with open(path, "rb") as fh:
+        text = fh.read().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _walk_yml_files(top: str) -> List[str]:
+    """List .yml files under top in the order os.walk would visit them."""
+    try:
+        with os.scandir(top) as it:
+            entries = list(it)
+    except OSError:
+        return []
+    names: List[str] = []
+    subdirs: List[str] = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            if not entry.is_symlink():
+                subdirs.append(entry.path)
+        elif entry.name.endswith(".yml"):
+            names.append(entry.name)
+    paths = [os.path.join(top, name) for name in sorted(names)]
+    for subdir in subdirs:
+        paths.extend(_walk_yml_files(subdir))
+    return paths
+
+
+@functools.lru_cache(maxsize=None)
+def _audit_yml_files(audit_dir: str) -> Tuple[str, ...]:
+    """All .yml files under the audit content subdirectories.
+
+    Walked once per run and shared by every extractor and check that scans
+    the audit tree.
+    """
+    return tuple(path for subdir in _find_audit_subdirs(audit_dir)
+                 for path in _walk_yml_files(subdir))
+
+
+def _first_match_per_line(pattern: re.Pattern, text: str) -> List[str]:
+    """Collect group 1 of the first match on each line of text, de-duplicated.
+
+    Equivalent to calling pattern.search() on every line, but scans the text
+    in one go, jumping to the next line after each match.
+    """
+    found: List[str] = []
+    pos = 0
+    while True:
+        m = pattern.search(text, pos)
+        if m is None:
+            break
+        value = m.group(1)
+        if value not in found:
+            found.append(value)
+        pos = text.find("\n", m.end()) + 1
+        if not pos:
+            break
+    return found
+
+
+def _lines_matching(patterns: Sequence[re.Pattern], text: str) -> Iterator[str]:
+    """Yield, in order, each line of text on which any of patterns matches.
+
+    Each pattern gets one scan of the whole text, jumping to the next line
+    after a hit, so lines without a match are never split out.  Separate
+    scans keep each pattern's literal-prefix search, which an alternation
+    would lose.
+    """
+    starts: Set[int] = set()
+    for pattern in patterns:
+        pos = 0
+        while True:
+            m = pattern.search(text, pos)
+            if m is None:
+                break
+            starts.add(text.rfind("\n", 0, m.start()) + 1)
+            pos = text.find("\n", m.end()) + 1
+            if not pos:
+                break
+    for start in sorted(starts):
+        end = text.find("\n", start)
+        yield text[start:] if end < 0 else text[start:end]
+
+
 # ---------------------------------------------------------------------------
 # Extraction: non-toggle config variables
 # ---------------------------------------------------------------------------
@@ -804,32 +1078,6 @@ def extract_template_variables(
     return variables
 
 
-def extract_goss_var_references(audit_dir: str) -> Dict[str, Set[str]]:
-    """Extract all .Vars.xxx references from goss audit test files.
-
-    Returns {variable_name: {set_of_relative_filepaths}}.
-    """
-    var_pat = re.compile(r"\.Vars\.(\w+)")
-    references: Dict[str, Set[str]] = defaultdict(set)
-    audit_dirs = _find_audit_subdirs(audit_dir)
-
-    for subdir in audit_dirs:
-        for root, _dirs, files in os.walk(subdir):
-            for fname in sorted(files):
-                if not fname.endswith(".yml"):
-                    continue
-                fpath = os.path.join(root, fname)
-                rel = os.path.relpath(fpath, audit_dir)
-                try:
-                    with open(fpath, "r", encoding="utf-8") as fh:
-                        for line in fh:
-                            for m in var_pat.finditer(line):
-                                references[m.group(1)].add(rel)
-                except (IOError, OSError):
-                    pass
-    return dict(references)
-
-
 def extract_audit_vars_defined(audit_vars_path: str) -> Set[str]:
     """Extract all top-level variable names defined in the audit vars file.
 
@@ -844,7 +1092,7 @@ def extract_audit_vars_defined(audit_vars_path: str) -> Set[str]:
                     continue
                 if stripped[0] in (" ", "\t"):
                     continue  # skip indented (nested) lines
-                m = re.match(r"^(\w+)\s*:", stripped)
+                m = VAR_DEFINITION_RE.match(stripped)
                 if m:
                     defined.add(m.group(1))
     except FileNotFoundError:
@@ -866,27 +1114,12 @@ def toggle_to_rule_key(toggle: str, prefix: str, rule_id_prefix: str,
     if benchmark_type == BENCHMARK_CIS:
         return toggle  # CIS keys are the toggle names themselves
 
-    m = re.match(rf"^{re.escape(prefix)}_(\d{{6}})$", toggle)
+    m = build_toggle_name_pattern(prefix, BENCHMARK_STIG).match(toggle)
     if m and rule_id_prefix:
         return f"{rule_id_prefix}-{m.group(1)}"
     return ""
 
 
-def rule_key_to_toggle(key: str, prefix: str, benchmark_type: str) -> str:
-    """Convert a rule key back to a toggle variable name.
-
-    STIG: 'AZLX-23-000100' -> 'az2023stig_000100'
-    CIS:  'rhel9cis_rule_1_1_1_1' -> 'rhel9cis_rule_1_1_1_1' (identity)
-    """
-    if benchmark_type == BENCHMARK_CIS:
-        return key
-
-    m = re.search(r"(\d{6})$", key)
-    if m:
-        return f"{prefix}_{m.group(1)}"
-    return ""
-
-
 # ---------------------------------------------------------------------------
 # Check implementations
 # ---------------------------------------------------------------------------
@@ -973,28 +1206,27 @@ def check_audit_coverage(
     """Check 2: Every rule toggle has an audit file and vice-versa."""
     findings: List[Finding] = []
 
-    # Build set of rule keys from defaults
-    default_keys: Set[str] = set()
-    for toggle in defaults_toggles:
+    # Map rule keys from defaults to their toggle's line number
+    default_keys: Dict[str, int] = {}
+    for toggle, lineno in defaults_toggles.items():
         key = toggle_to_rule_key(toggle, prefix, rule_id_prefix, benchmark_type)
         if key:
-            default_keys.add(key)
+            default_keys[key] = lineno
 
-    audit_keys = set(audit_files.keys())
+    audit_keys = audit_files.keys()
 
     # Rules with no audit file
-    for key in sorted(default_keys - audit_keys):
-        toggle = rule_key_to_toggle(key, prefix, benchmark_type)
+    for key in sorted(default_keys.keys() - audit_keys):
         findings.append(Finding(
             file="defaults/main.yml",
-            line=defaults_toggles.get(toggle, 0),
+            line=default_keys[key],
             description=f"Rule has no audit file: '{key}'",
             severity="warning",
             check_name="audit_coverage",
         ))
 
     # Audit files with no rule toggle
-    for key in sorted(audit_keys - default_keys):
+    for key in sorted(audit_keys - default_keys.keys()):
         info = audit_files[key]
         findings.append(Finding(
             file=info["file"],
@@ -1015,7 +1247,7 @@ def check_rule_id_match(
 ) -> CheckResult:
     """Check 3: Rule_IDs match between task tags and audit metadata."""
     findings: List[Finding] = []
-    common = set(task_data.keys()) & set(audit_files.keys())
+    common = task_data.keys() & audit_files.keys()
 
     for sid in sorted(common):
         task_rid = task_data[sid].get("rule_id")
@@ -1083,7 +1315,7 @@ def check_rule_key_match(
                 ))
 
     # Keys only in tasks (no audit)
-    task_only = set(task_data.keys()) - set(audit_files.keys())
+    task_only = task_data.keys() - audit_files.keys()
     for key in sorted(task_only):
         findings.append(Finding(
             file=task_data[key]["file"],
@@ -1094,7 +1326,7 @@ def check_rule_key_match(
         ))
 
     # Keys only in audit (no task)
-    audit_only = set(audit_files.keys()) - set(task_data.keys())
+    audit_only = audit_files.keys() - task_data.keys()
     for key in sorted(audit_only):
         findings.append(Finding(
             file=audit_files[key]["file"],
@@ -1115,7 +1347,7 @@ def check_category_alignment(
 ) -> CheckResult:
     """Check 5: Rules live in matching cat_X/section_X dirs in both repos."""
     findings: List[Finding] = []
-    common = set(task_data.keys()) & set(audit_files.keys())
+    common = task_data.keys() & audit_files.keys()
 
     for sid in sorted(common):
         task_cat = task_data[sid].get("cat")
@@ -1183,9 +1415,15 @@ def check_goss_include_coverage(
     """Check 7: Every audit file is reachable via goss.yml glob patterns."""
     findings: List[Finding] = []
 
+    # One regex for all globs, matched the way fnmatch.fnmatch does
+    # (normcase on both sides); no globs means nothing is reachable
+    globs_pat = re.compile("|".join(
+        fnmatch.translate(os.path.normcase(p)) for p in goss_globs
+    )) if goss_globs else None
+
     for _sid, info in sorted(audit_files.items()):
         rel = info["file"]
-        if not any(fnmatch.fnmatch(rel, p) for p in goss_globs):
+        if globs_pat is None or not globs_pat.match(os.path.normcase(rel)):
             findings.append(Finding(
                 file=rel,
                 line=0,
@@ -1211,28 +1449,34 @@ def check_config_variable_parity(
     """
     findings: List[Finding] = []
 
-    common = set(defaults_config.keys()) & set(audit_config.keys())
-    for var in sorted(common):
-        def_val, _def_line = defaults_config[var]
-        aud_val, aud_line = audit_config[var]
+    # One lookup per defaults entry; only the mismatches need sorting
+    mismatched: List[Tuple[str, str, str, int]] = []
+    for var, (def_val, _def_line) in defaults_config.items():
+        aud = audit_config.get(var)
+        if aud is None:
+            continue
+        aud_val, aud_line = aud
 
         # Skip multi-line/block values (starting with |, >, or [)
-        if def_val in ("|", ">", "|-", ">-") or aud_val in ("|", ">", "|-", ">-"):
+        if def_val in YAML_BLOCK_INDICATORS or aud_val in YAML_BLOCK_INDICATORS:
             continue
         if def_val.startswith("[") or aud_val.startswith("["):
             continue
 
         if def_val != aud_val:
-            findings.append(Finding(
-                file=audit_vars_name,
-                line=aud_line,
-                description=(
-                    f"Config value mismatch for '{var}': "
-                    f"defaults='{def_val}' vs {audit_vars_name}='{aud_val}'"
-                ),
-                severity="warning",
-                check_name="config_variable_parity",
-            ))
+            mismatched.append((var, def_val, aud_val, aud_line))
+
+    for var, def_val, aud_val, aud_line in sorted(mismatched):
+        findings.append(Finding(
+            file=audit_vars_name,
+            line=aud_line,
+            description=(
+                f"Config value mismatch for '{var}': "
+                f"defaults='{def_val}' vs {audit_vars_name}='{aud_val}'"
+            ),
+            severity="warning",
+            check_name="config_variable_parity",
+        ))
 
     status = _determine_status(findings, warn_on_any=True)
     return CheckResult("Config Variable Parity", status, findings,
@@ -1256,7 +1500,7 @@ def check_goss_template_var_sync(
             continue
 
         # Skip block indicators
-        if val in ("|", ">", "|-", ">-"):
+        if val in YAML_BLOCK_INDICATORS:
             continue
 
         # Skip empty values (multiline structure parent keys like dicts/lists)
@@ -1268,7 +1512,7 @@ def check_goss_template_var_sync(
         # structural vars like bootloader paths, sshd_limited, etc.)
         if var in defaults_config:
             def_val, _def_line = defaults_config[var]
-            if def_val in ("|", ">", "|-", ">-"):
+            if def_val in YAML_BLOCK_INDICATORS:
                 continue
             if val != def_val:
                 findings.append(Finding(
@@ -1300,24 +1544,17 @@ def check_audit_vars_completeness(
     """
     findings: List[Finding] = []
 
-    # Well-known runtime variables injected by the audit script/goss runner
-    # (not expected to be in vars file)
-    runtime_vars = {
-        "machine_uuid", "epoch", "os_locale", "os_release",
-        "os_distribution", "auto_group", "os_hostname", "system_type",
-        "benchmark_type", "benchmark_version", "benchmark_os",
-        "system_is_container",
-    }
-
+    prefix_underscore = prefix + "_"
     for var, files in sorted(goss_var_refs.items()):
-        # Skip rule toggles (covered by check 1)
-        if _is_toggle_var(var, prefix, benchmark_type):
+        # Cheapest tests first; every toggle name carries the prefix
+        # Skip non-prefixed variables (general goss/system vars)
+        if not var.startswith(prefix_underscore):
             continue
         # Skip known runtime variables
-        if var in runtime_vars:
+        if var in RUNTIME_VARS:
             continue
-        # Skip non-prefixed variables (general goss/system vars)
-        if not var.startswith(prefix + "_"):
+        # Skip rule toggles (covered by check 1)
+        if _is_toggle_var(var, prefix, benchmark_type):
             continue
         # Check if defined in audit vars
         if var not in audit_vars_defined:
@@ -1352,27 +1589,33 @@ def check_toggle_value_sync(
     the audit will skip a test that remediation actively runs (and vice-versa).
     """
     findings: List[Finding] = []
-    common = set(defaults_values.keys()) & set(audit_values.keys())
 
-    for var in sorted(common):
-        def_val, _def_line = defaults_values[var]
-        aud_val, aud_line = audit_values[var]
+    # One lookup per defaults entry; only the mismatches need sorting
+    mismatched: List[Tuple[str, str, str, int]] = []
+    for var, (def_val, _def_line) in defaults_values.items():
+        aud = audit_values.get(var)
+        if aud is None:
+            continue
+        aud_val, aud_line = aud
 
         # Normalize boolean strings for comparison
         def_norm = def_val.lower().strip()
         aud_norm = aud_val.lower().strip()
 
         if def_norm != aud_norm:
-            findings.append(Finding(
-                file=audit_vars_name,
-                line=aud_line,
-                description=(
-                    f"Toggle value mismatch for '{var}': "
-                    f"defaults='{def_val}' vs {audit_vars_name}='{aud_val}'"
-                ),
-                severity="warning",
-                check_name="toggle_value_sync",
-            ))
+            mismatched.append((var, def_val, aud_val, aud_line))
+
+    for var, def_val, aud_val, aud_line in sorted(mismatched):
+        findings.append(Finding(
+            file=audit_vars_name,
+            line=aud_line,
+            description=(
+                f"Toggle value mismatch for '{var}': "
+                f"defaults='{def_val}' vs {audit_vars_name}='{aud_val}'"
+            ),
+            severity="warning",
+            check_name="toggle_value_sync",
+        ))
 
     status = _determine_status(findings, warn_on_any=True)
     return CheckResult("Toggle Value Sync", status, findings,
@@ -1395,8 +1638,9 @@ def check_severity_directory(
                            "CIS benchmarks do not use severity labels")
 
     severity_to_cat = {"HIGH": 1, "MEDIUM": 2, "LOW": 3}
-    severity_pat = re.compile(r"^\s*-?\s*name:\s*\"?(HIGH|MEDIUM|LOW)\s*\|", re.IGNORECASE)
+    severity_pat = TASK_SEVERITY_RE
 
+    tasks_parent = os.path.dirname(tasks_dir)
     for cat in ("cat_1", "cat_2", "cat_3"):
         cat_path = os.path.join(tasks_dir, cat)
         if not os.path.isdir(cat_path):
@@ -1407,7 +1651,7 @@ def check_severity_directory(
             if not fname.endswith(".yml") or fname == "main.yml":
                 continue
             fpath = os.path.join(cat_path, fname)
-            rel = os.path.relpath(fpath, os.path.dirname(tasks_dir))
+            rel = _relpath_under(fpath, tasks_parent)
 
             try:
                 with open(fpath, "r", encoding="utf-8") as fh:
@@ -1436,46 +1680,27 @@ def check_severity_directory(
                        f"{len(findings)} issue(s)")
 
 
-def check_goss_block_pairing(audit_dir: str) -> CheckResult:
+def check_goss_block_pairing(block_counts: Dict[str, Tuple[int, int]]) -> CheckResult:
     """Check 13: Validate if/range/end block pairing in audit files.
 
-    Counts opening blocks ({{ if ... }}, {{ range ... }}) and closing
-    blocks ({{ end }}) in each audit file and reports mismatches.
+    Compares the opening blocks ({{ if ... }}, {{ range ... }}) and closing
+    blocks ({{ end }}) counted per audit file by scan_audit_tree and
+    reports mismatches.
     """
     findings: List[Finding] = []
-    open_pat = re.compile(r"\{\{-?\s*(if|range)\s+")
-    close_pat = re.compile(r"\{\{-?\s*end\s*-?\}\}")
-    audit_dirs = _find_audit_subdirs(audit_dir)
-
-    for subdir in audit_dirs:
-        for root, _dirs, files in os.walk(subdir):
-            for fname in sorted(files):
-                if not fname.endswith(".yml") or fname in ("goss.yml", "main.yml"):
-                    continue
-                fpath = os.path.join(root, fname)
-                rel = os.path.relpath(fpath, audit_dir)
-
-                opens = 0
-                closes = 0
-                try:
-                    with open(fpath, "r", encoding="utf-8") as fh:
-                        for line in fh:
-                            opens += len(open_pat.findall(line))
-                            closes += len(close_pat.findall(line))
-                except (IOError, OSError):
-                    continue
 
-                if opens != closes:
-                    findings.append(Finding(
-                        file=rel,
-                        line=0,
-                        description=(
-                            f"Block mismatch: {opens} opening "
-                            f"(if/range) vs {closes} closing (end)"
-                        ),
-                        severity="warning",
-                        check_name="goss_block_pairing",
-                    ))
+    for rel, (opens, closes) in block_counts.items():
+        if opens != closes:
+            findings.append(Finding(
+                file=rel,
+                line=0,
+                description=(
+                    f"Block mismatch: {opens} opening "
+                    f"(if/range) vs {closes} closing (end)"
+                ),
+                severity="warning",
+                check_name="goss_block_pairing",
+            ))
 
     status = _determine_status(findings, warn_on_any=True)
     return CheckResult("Goss Block Pairing", status, findings,
@@ -1507,6 +1732,7 @@ def check_when_toggle_alignment(
         rf"when:\s*.*({re.escape(prefix)}_\d{{6}})"
     )
 
+    tasks_parent = os.path.dirname(tasks_dir)
     for cat in ("cat_1", "cat_2", "cat_3"):
         cat_path = os.path.join(tasks_dir, cat)
         if not os.path.isdir(cat_path):
@@ -1515,47 +1741,45 @@ def check_when_toggle_alignment(
             if not fname.endswith(".yml") or fname == "main.yml":
                 continue
             fpath = os.path.join(cat_path, fname)
-            rel = os.path.relpath(fpath, os.path.dirname(tasks_dir))
+            rel = _relpath_under(fpath, tasks_parent)
 
             try:
                 with open(fpath, "r", encoding="utf-8") as fh:
-                    lines = fh.readlines()
-            except (IOError, OSError):
-                continue
+                    current_stig_id: Optional[str] = None
+                    for lineno, line in enumerate(fh, 1):
+                        stripped = line.strip()
 
-            current_stig_id: Optional[str] = None
-            for lineno, line in enumerate(lines, 1):
-                stripped = line.strip()
+                        # Detect STIG_ID from task name
+                        if stripped.startswith("- name:") or stripped.startswith("name:"):
+                            m = stig_id_pat.search(stripped)
+                            if m:
+                                current_stig_id = m.group(1).upper()
 
-                # Detect STIG_ID from task name
-                if stripped.startswith("- name:") or stripped.startswith("name:"):
-                    m = stig_id_pat.search(stripped)
-                    if m:
-                        current_stig_id = m.group(1).upper()
-
-                # Check when: condition
-                if current_stig_id and "when:" in stripped:
-                    m = when_pat.search(stripped)
-                    if m:
-                        when_toggle = m.group(1)
-                        # Derive expected toggle from STIG_ID
-                        digits = re.search(r"(\d{6})$", current_stig_id)
-                        if digits:
-                            expected_toggle = f"{prefix}_{digits.group(1)}"
-                            if when_toggle != expected_toggle:
-                                findings.append(Finding(
-                                    file=rel,
-                                    line=lineno,
-                                    description=(
-                                        f"When-toggle mismatch for "
-                                        f"{current_stig_id}: "
-                                        f"expected '{expected_toggle}' but "
-                                        f"found '{when_toggle}'"
-                                    ),
-                                    severity="error",
-                                    check_name="when_toggle_alignment",
-                                ))
-                        current_stig_id = None  # reset after checking
+                        # Check when: condition
+                        if current_stig_id and "when:" in stripped:
+                            m = when_pat.search(stripped)
+                            if m:
+                                when_toggle = m.group(1)
+                                # Derive expected toggle from STIG_ID
+                                digits = RULE_NUMBER_SUFFIX_RE.search(current_stig_id)
+                                if digits:
+                                    expected_toggle = f"{prefix}_{digits.group(1)}"
+                                    if when_toggle != expected_toggle:
+                                        findings.append(Finding(
+                                            file=rel,
+                                            line=lineno,
+                                            description=(
+                                                f"When-toggle mismatch for "
+                                                f"{current_stig_id}: "
+                                                f"expected '{expected_toggle}' but "
+                                                f"found '{when_toggle}'"
+                                            ),
+                                            severity="error",
+                                            check_name="when_toggle_alignment",
+                                        ))
+                                current_stig_id = None  # reset after checking
+            except (IOError, OSError):
+                continue
 
     status = _determine_status(findings, warn_on_any=True)
     return CheckResult("When-Toggle Alignment", status, findings,
@@ -1659,6 +1883,10 @@ def generate_markdown(metadata: ReportMetadata,
 
 def _html_escape(text: str) -> str:
     """Escape HTML special characters."""
+    # Most names and paths are clean; the membership tests are cheaper
+    # than four replace() passes.
+    if not ("&" in text or "<" in text or ">" in text or '"' in text):
+        return text
     return (text.replace("&", "&amp;").replace("<", "&lt;")
                 .replace(">", "&gt;").replace('"', "&quot;"))
 
@@ -1676,6 +1904,19 @@ _SEVERITY_COLOURS = {
     "info": "#17a2b8",
 }
 
+_BADGE_CLASSES = {
+    "PASS": "badge-pass",
+    "FAIL": "badge-fail",
+    "WARN": "badge-warn",
+    "SKIP": "badge-skip",
+}
+
+_SEVERITY_CLASSES = {
+    "error": "sev-error",
+    "warning": "sev-warning",
+    "info": "sev-info",
+}
+
 
 def generate_html(metadata: ReportMetadata,
                   results: List[CheckResult]) -> str:
@@ -1791,8 +2032,8 @@ def generate_html(metadata: ReportMetadata,
     # Overview table
     parts.append("<div class='overview-table'><table>")
     parts.append("<tr><th>Check</th><th>Description</th><th>Status</th><th>Findings</th></tr>")
-    for r in results:
-        badge_cls = f"badge-{r.status.lower()}"
+    badge_classes = [_BADGE_CLASSES[r.status] for r in results]
+    for r, badge_cls in zip(results, badge_classes):
         desc = CHECK_DESCRIPTIONS.get(r.name, "")
         parts.append(
             f"<tr><td>{h(r.name)}</td>"
@@ -1803,8 +2044,7 @@ def generate_html(metadata: ReportMetadata,
     parts.append("</table></div>\n")
 
     # Per-check detail sections
-    for r in results:
-        badge_cls = f"badge-{r.status.lower()}"
+    for r, badge_cls in zip(results, badge_classes):
         collapsed = " collapsed" if r.status == "PASS" and not r.findings else ""
         parts.append(f"<div class='check-section{collapsed}'>")
         desc = CHECK_DESCRIPTIONS.get(r.name, "")
@@ -1832,7 +2072,7 @@ def generate_html(metadata: ReportMetadata,
             parts.append("<table><tr><th>Severity</th><th>File</th>"
                          "<th>Line</th><th>Description</th></tr>")
             for f in r.findings[:200]:
-                sev_cls = f"sev-{f.severity}"
+                sev_cls = _SEVERITY_CLASSES[f.severity]
                 line_str = str(f.line) if f.line > 0 else "-"
                 parts.append(
                     f"<tr><td class='{sev_cls}'>{h(f.severity)}</td>"
@@ -1859,6 +2099,13 @@ def generate_html(metadata: ReportMetadata,
     return "\n".join(parts)
 
 
+def _json_dumps_indented(obj) -> str:
+    """Serialize obj as two-space indented JSON, using orjson if available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
+
+
 def generate_json(metadata: ReportMetadata,
                   results: List[CheckResult]) -> str:
     """Generate a JSON report."""
@@ -1874,12 +2121,19 @@ def generate_json(metadata: ReportMetadata,
                 "status": r.status,
                 "criteria": CHECK_CRITERIA.get(r.name, ""),
                 "summary": r.summary,
-                "findings": [asdict(f) for f in r.findings],
+                # asdict() deep-copies field by field; Finding is flat,
+                # so build the dict directly.
+                "findings": [
+                    {"file": f.file, "line": f.line,
+                     "description": f.description, "severity": f.severity,
+                     "check_name": f.check_name}
+                    for f in r.findings
+                ],
             }
             for r in results
         ],
     }
-    return json.dumps(report, indent=2)
+    return _json_dumps_indented(report)
 
 
 def generate_report(metadata: ReportMetadata,
@@ -2152,6 +2406,15 @@ Check keys for --skip / --only:
         "--no-report", action="store_true",
         help="Skip writing report file",
     )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, metavar="N",
+        help="Worker threads for reading and scanning audit files (default: 1)",
+    )
+    parser.add_argument(
+        "--cache", default=None, metavar="PATH",
+        help="JSON file caching per-file audit scan results; unchanged "
+             "files are not re-read on later runs",
+    )
     return parser
 
 
@@ -2165,6 +2428,9 @@ def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
 
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
     remediation_dir = os.path.abspath(args.remediation)
     if not os.path.isdir(remediation_dir):
         print(f"Error: remediation directory not found: {remediation_dir}",
@@ -2215,6 +2481,7 @@ def main() -> None:
 
     # Build patterns for this benchmark type
     toggle_pat = build_toggle_pattern(prefix, benchmark_type)
+    toggle_def_pat = build_toggle_definition_pattern(prefix, benchmark_type)
     cond_pat = build_conditional_pattern(prefix, benchmark_type)
 
     # Detect rule ID prefix (STIG only)
@@ -2234,24 +2501,23 @@ def main() -> None:
     # Extract data
     # -----------------------------------------------------------------------
     log("Extracting rule toggles from defaults/main.yml...")
-    defaults_toggles = extract_rule_toggles(defaults_path, toggle_pat)
+    defaults_toggles = extract_rule_toggles(defaults_path, toggle_def_pat)
     log(f"  Found {len(defaults_toggles)} toggles")
 
     log("Extracting rule toggles from goss template...")
-    template_toggles = extract_rule_toggles(template_path, toggle_pat)
+    template_toggles = extract_rule_toggles(template_path, toggle_def_pat)
     log(f"  Found {len(template_toggles)} toggles")
 
     log(f"Extracting rule toggles from {audit_vars_name}...")
-    audit_vars_toggles = extract_rule_toggles(audit_vars_path, toggle_pat)
+    audit_vars_toggles = extract_rule_toggles(audit_vars_path, toggle_def_pat)
     log(f"  Found {len(audit_vars_toggles)} toggles")
 
-    log("Extracting audit file conditionals...")
-    audit_conditionals = extract_audit_conditionals(audit_dir, cond_pat)
+    log("Scanning audit files (conditionals, metadata, .Vars references, blocks)...")
+    audit_conditionals, audit_files, goss_var_refs, block_counts = scan_audit_tree(
+        audit_dir, benchmark_type, cond_pat, args.jobs, args.cache)
     log(f"  Found {len(audit_conditionals)} conditionals")
-
-    log("Extracting audit file metadata...")
-    audit_files = extract_audit_files(audit_dir, benchmark_type, prefix)
     log(f"  Found {len(audit_files)} audit files")
+    log(f"  Found {len(goss_var_refs)} unique variable references")
 
     log("Extracting task data...")
     task_data = extract_task_data(tasks_dir, benchmark_type, prefix,
@@ -2278,20 +2544,16 @@ def main() -> None:
     template_vars = extract_template_variables(template_path, prefix, toggle_pat)
     log(f"  Found {len(template_vars)} template variables")
 
-    log("Extracting goss .Vars references from audit test files...")
-    goss_var_refs = extract_goss_var_references(audit_dir)
-    log(f"  Found {len(goss_var_refs)} unique variable references")
-
     log(f"Extracting defined variables from {audit_vars_name}...")
     audit_vars_defined = extract_audit_vars_defined(audit_vars_path)
     log(f"  Found {len(audit_vars_defined)} defined variables")
 
     log("Extracting toggle values from defaults/main.yml...")
-    defaults_toggle_values = extract_toggle_values(defaults_path, toggle_pat)
+    defaults_toggle_values = extract_toggle_values(defaults_path, toggle_def_pat)
     log(f"  Found {len(defaults_toggle_values)} toggle values")
 
     log(f"Extracting toggle values from {audit_vars_name}...")
-    audit_toggle_values = extract_toggle_values(audit_vars_path, toggle_pat)
+    audit_toggle_values = extract_toggle_values(audit_vars_path, toggle_def_pat)
     log(f"  Found {len(audit_toggle_values)} toggle values")
 
     # -----------------------------------------------------------------------
@@ -2332,7 +2594,7 @@ def main() -> None:
          defaults_toggle_values, audit_toggle_values, audit_vars_name)
     _run("severity_directory", check_severity_directory,
          benchmark_type, tasks_dir)
-    _run("goss_block_pairing", check_goss_block_pairing, audit_dir)
+    _run("goss_block_pairing", check_goss_block_pairing, block_counts)
     _run("when_toggle_alignment", check_when_toggle_alignment,
          tasks_dir, prefix, rule_id_prefix, benchmark_type)
 
@@ -2350,10 +2612,12 @@ def main() -> None:
     # Resolve benchmark version for metadata (use defaults/main.yml as primary)
     bm_version = versions.get("defaults/main.yml", "")
 
+    # One timestamp for both the report date and the default file name
+    now = datetime.datetime.now()
     metadata = ReportMetadata(
         remediation_repo=os.path.basename(remediation_dir),
         audit_repo=os.path.basename(audit_dir),
-        date=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        date=now.strftime("%Y-%m-%d %H:%M:%S"),
         benchmark_prefix=prefix,
         benchmark_type=benchmark_type,
         rule_id_prefix=rule_id_prefix,
@@ -2371,7 +2635,7 @@ def main() -> None:
         ext = {"json": "json", "html": "html"}.get(args.format, "md")
         repo_name = metadata.remediation_repo
         bm_ver = metadata.benchmark_version.replace(".", "_") if metadata.benchmark_version else "unknown"
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        timestamp = now.strftime("%Y-%m-%d_%H%M%S")
         output_path = args.output or f"cross_repo_report_{repo_name}_{bm_ver}_{timestamp}.{ext}"
         with open(output_path, "w", encoding="utf-8") as fh:
             fh.write(report)
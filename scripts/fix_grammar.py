@@ -14,6 +14,9 @@ Usage:
 """
 
 import argparse
+import bisect
+import concurrent.futures
+import itertools
 import os
 import re
 import sys
@@ -23,6 +26,8 @@ import sys
 # ---------------------------------------------------------------------------
 
 REPEATED_WORDS = re.compile(r'\b(\w+)\s+\1\b', re.IGNORECASE)
+# REPEATED_WORDS limited to one line, for scanning a whole file at once
+REPEATED_WORDS_IN_LINE = re.compile(r'\b(\w+)[^\S\n]+\1\b', re.IGNORECASE)
 
 APOSTROPHE_FIXES = {
     r'\bwont\b': "won't",
@@ -44,6 +49,15 @@ APOSTROPHE_FIXES = {
     r'\byoure\b': "you're",
 }
 
+# All of APOSTROPHE_FIXES as one alternation, one capture group per entry,
+# so each line is scanned once; match.lastindex picks the replacement.
+APOSTROPHE_RE = re.compile(
+    r'\b(?:' + '|'.join(f'({pattern[2:-2]})' for pattern in APOSTROPHE_FIXES) + r')\b',
+    re.IGNORECASE)
+APOSTROPHE_REPLACEMENTS = (None,) + tuple(APOSTROPHE_FIXES.values())
+# The bare words, for a substring pre-check before running the regex
+APOSTROPHE_WORDS = tuple(pattern[2:-2] for pattern in APOSTROPHE_FIXES)
+
 SUBJECT_VERB_FIXES = [
     (re.compile(r'\bThis variables is\b'), 'This variable is'),
     (re.compile(r'\bThe given values is\b'), 'The given value is'),
@@ -52,6 +66,10 @@ SUBJECT_VERB_FIXES = [
     (re.compile(r'\bThis controls is\b'), 'This control is'),
     (re.compile(r'\bThis parameters is\b'), 'This parameter is'),
 ]
+# Every SUBJECT_VERB_FIXES pattern contains this literal
+SUBJECT_VERB_LITERAL = 's is'
+# The bare phrases, for finding candidate lines in a whole file
+SUBJECT_VERB_PHRASES = tuple(pattern.pattern[2:-2] for pattern, _ in SUBJECT_VERB_FIXES)
 
 # Words that are OK to repeat (YAML values, common patterns)
 REPEAT_WHITELIST = frozenset({
@@ -66,6 +84,9 @@ BACKTICK_CONTENT = re.compile(r'`[^`]*`')
 
 DEFAULT_SKIP_DIRS = {'.git', '.github', 'molecule', 'tests', '__pycache__', '.ansible'}
 
+# A NUL byte this close to the start marks a file as binary (git's heuristic)
+BINARY_SNIFF_BYTES = 8000
+
 
 # ---------------------------------------------------------------------------
 # Scanning
@@ -73,12 +94,25 @@ DEFAULT_SKIP_DIRS = {'.git', '.github', 'molecule', 'tests', '__pycache__', '.an
 
 def find_files(repo_path, skip_dirs):
     """Find all eligible files in the repo."""
+    extensions = tuple(EXTENSIONS)
     files = []
-    for root, dirs, filenames in os.walk(repo_path):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for fname in filenames:
-            if any(fname.endswith(ext) for ext in EXTENSIONS):
-                files.append(os.path.join(root, fname))
+    pending = [repo_path]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if entry.name not in skip_dirs and not entry.is_symlink():
+                        pending.append(entry.path)
+                elif entry.name.endswith(extensions):
+                    files.append(entry.path)
     return sorted(files)
 
 
@@ -92,13 +126,11 @@ def check_repeated_words(line, line_num, filepath):
     issues = []
     for match in REPEATED_WORDS.finditer(line):
         word = match.group(1).lower()
-        if word in REPEAT_WHITELIST and f'{word} {word}' not in line.lower():
-            continue
-        if word in REPEAT_WHITELIST:
-            # Only flag if it's literally "word word" adjacent
-            pass
         if len(word) < 2:
             continue
+        # Whitelisted words are only flagged if literally "word word" adjacent
+        if word in REPEAT_WHITELIST and f'{word} {word}' not in line.lower():
+            continue
         issues.append({
             'file': filepath,
             'line': line_num,
@@ -112,22 +144,35 @@ def check_repeated_words(line, line_num, filepath):
 
 def check_apostrophes(line, line_num, filepath):
     """Check for missing apostrophes."""
+    if line.isascii():
+        # IGNORECASE also folds some non-ASCII letters onto ASCII ones, so
+        # the substring pre-check is only exact for ASCII lines
+        lowered = line.lower()
+        for word in APOSTROPHE_WORDS:
+            if word in lowered:
+                break
+        else:
+            return []
     issues = []
-    for pattern, replacement in APOSTROPHE_FIXES.items():
-        for match in re.finditer(pattern, line, re.IGNORECASE):
-            issues.append({
-                'file': filepath,
-                'line': line_num,
-                'severity': 'warning',
-                'description': f"Missing apostrophe: '{match.group()}' -> '{replacement}'",
-                'match': match.group(),
-                'fix': replacement,
-            })
+    # Report in APOSTROPHE_FIXES order, as the per-pattern scans did
+    matches = sorted(APOSTROPHE_RE.finditer(line), key=lambda m: m.lastindex)
+    for match in matches:
+        replacement = APOSTROPHE_REPLACEMENTS[match.lastindex]
+        issues.append({
+            'file': filepath,
+            'line': line_num,
+            'severity': 'warning',
+            'description': f"Missing apostrophe: '{match.group()}' -> '{replacement}'",
+            'match': match.group(),
+            'fix': replacement,
+        })
     return issues
 
 
 def check_subject_verb(line, line_num, filepath):
     """Check for subject-verb disagreements."""
+    if SUBJECT_VERB_LITERAL not in line:
+        return []
     issues = []
     for pattern, replacement in SUBJECT_VERB_FIXES:
         if pattern.search(line):
@@ -142,18 +187,54 @@ def check_subject_verb(line, line_num, filepath):
     return issues
 
 
+def candidate_offsets(text):
+    """Yield offsets in text where one of the line checks could match.
+
+    A superset: the per-line checks still decide what is reported.
+    """
+    for match in REPEATED_WORDS_IN_LINE.finditer(text):
+        yield match.start()
+    if text.isascii():
+        lowered = text.lower()
+        for literal in APOSTROPHE_WORDS:
+            pos = lowered.find(literal)
+            while pos != -1:
+                yield pos
+                pos = lowered.find(literal, pos + 1)
+    else:
+        for match in APOSTROPHE_RE.finditer(text):
+            yield match.start()
+    for literal in SUBJECT_VERB_PHRASES:
+        pos = text.find(literal)
+        while pos != -1:
+            yield pos
+            pos = text.find(literal, pos + 1)
+
+
 def scan_file(filepath):
     """Scan a single file for grammar issues."""
     issues = []
     try:
         with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f, 1):
-                clean_line = strip_backticks(line)
-                issues.extend(check_repeated_words(clean_line, line_num, filepath))
-                issues.extend(check_apostrophes(clean_line, line_num, filepath))
-                issues.extend(check_subject_verb(clean_line, line_num, filepath))
+            if b'\0' in f.buffer.peek(BINARY_SNIFF_BYTES)[:BINARY_SNIFF_BYTES]:
+                return issues
+            lines = f.readlines()
     except (IOError, OSError) as e:
         print(f"  Error reading {filepath}: {e}", file=sys.stderr)
+        return issues
+
+    clean_lines = [strip_backticks(line) if '`' in line else line for line in lines]
+    # Scan the whole file once and run the line checks only where it found
+    # a candidate; most lines have none.
+    line_starts = list(itertools.accumulate(map(len, clean_lines), initial=0))
+    hit_lines = {bisect.bisect_right(line_starts, offset) - 1
+                 for offset in candidate_offsets(''.join(clean_lines))}
+    for index in sorted(hit_lines):
+        clean_line = clean_lines[index]
+        line_num = index + 1
+        issues.extend(check_repeated_words(clean_line, line_num, filepath))
+        issues.extend(check_apostrophes(clean_line, line_num, filepath))
+        issues.extend(check_subject_verb(clean_line, line_num, filepath))
     return issues
 
 
@@ -174,9 +255,10 @@ def apply_fixes(filepath, issues):
         match_text = issue.get('match', '')
         fix_text = issue.get('fix', '')
         if match_text and fix_text and match_text != fix_text:
-            new_content = re.sub(re.escape(match_text), fix_text, content, count=1)
-            if new_content != content:
-                content = new_content
+            # First occurrence only; a plain find needs no per-issue regex
+            pos = content.find(match_text)
+            if pos != -1:
+                content = content[:pos] + fix_text + content[pos + len(match_text):]
                 modified = True
 
     if modified:
@@ -197,8 +279,13 @@ def main():
     parser.add_argument('--fix', action='store_true', help='Apply fixes automatically')
     parser.add_argument('--skip-dir', nargs='*', default=[],
                         help='Additional directories to skip')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Worker processes for scanning files (default: 1)')
     args = parser.parse_args()
 
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
     if not os.path.isdir(args.repo_path):
         print(f"Error: {args.repo_path} is not a directory", file=sys.stderr)
         sys.exit(1)
@@ -208,8 +295,13 @@ def main():
     total_issues = 0
     files_with_issues = 0
 
-    for filepath in files:
-        issues = scan_file(filepath)
+    if args.jobs > 1 and len(files) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(scan_file, files, chunksize=16))
+    else:
+        results = [scan_file(filepath) for filepath in files]
+
+    for filepath, issues in zip(files, results):
         if issues:
             files_with_issues += 1
             rel_path = os.path.relpath(filepath, args.repo_path)